@@ -0,0 +1,210 @@
+import argparse
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from math import gcd
+
+# gmpy2 makes the big multiplications and divisions in the trees much
+# faster. Without it, the remainder tree divides with _mod below, since
+# CPython's own long division is quadratic before 3.12.
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+# Whether x % m is already subquadratic for huge ints: gmpy2, or CPython
+# 3.12+, which hands large divisions to a divide-and-conquer algorithm
+_FAST_DIVISION = gmpy2 is not None or sys.version_info >= (3, 12)
+
+# Scans larger than this warn when gmpy2 is missing
+LARGE_SCAN = 10_000
+
+# Divisors below this many bits are left to the builtin % operator
+_DIV_LIMIT = 4000
+
+def read_moduli(path):
+    """
+    Reads one modulus per line, decimal or 0x-prefixed hex.
+    Blank lines and lines starting with # are skipped.
+    Returns a list of (line_number, n).
+    """
+    moduli = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                moduli.append((line_number, int(line, 0)))
+    return moduli
+
+def _div2n1n(a, b, n):
+    """
+    Burnikel-Ziegler division of a < b * 2^n by an n-bit b: splits it into
+    two 3n/2-by-n divisions, so the work is done by Karatsuba
+    multiplications instead of schoolbook long division.
+    Returns (q, r).
+    """
+    if a.bit_length() - n <= _DIV_LIMIT:
+        return divmod(a, b)
+    pad = n & 1
+    if pad:
+        a <<= 1
+        b <<= 1
+        n += 1
+    half_n = n >> 1
+    mask = (1 << half_n) - 1
+    b1, b2 = b >> half_n, b & mask
+    q1, r = _div3n2n(a >> n, (a >> half_n) & mask, b, b1, b2, half_n)
+    q2, r = _div3n2n(r, a & mask, b, b1, b2, half_n)
+    if pad:
+        r >>= 1
+    return q1 << half_n | q2, r
+
+def _div3n2n(a12, a3, b, b1, b2, n):
+    """Helper for _div2n1n: divides (a12 << n | a3) by b = b1 << n | b2."""
+    if a12 >> n == b1:
+        q, r = (1 << n) - 1, a12 - (b1 << n) + b1
+    else:
+        q, r = _div2n1n(a12, b1, n)
+    r = (r << n | a3) - q * b2
+    while r < 0:
+        q -= 1
+        r += b
+    return q, r
+
+def _mod(x, m):
+    """x % m for x >= 0 and m > 0, subquadratic in the size of m."""
+    if _FAST_DIVISION or m.bit_length() <= _DIV_LIMIT:
+        return x % m
+    n = m.bit_length()
+    # Long division in base 2^n, one _div2n1n per digit of x
+    r = 0
+    for shift in range((x.bit_length() - 1) // n * n, -1, -n):
+        r = _div2n1n(r << n | (x >> shift) & ((1 << n) - 1), m, n)[1]
+    return r
+
+class _Levels:
+    """
+    The levels of a product tree, kept in memory or, with spill_dir,
+    pickled to one file per level so only the level being worked on
+    has to be in memory.
+    """
+
+    def __init__(self, spill_dir=None):
+        self.spill_dir = spill_dir
+        self._levels = []
+
+    def append(self, level):
+        if self.spill_dir is None:
+            self._levels.append(level)
+            return
+        path = os.path.join(self.spill_dir, f"level-{len(self._levels)}.pickle")
+        with open(path, 'wb') as f:
+            pickle.dump(level, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._levels.append(path)
+
+    def __len__(self):
+        return len(self._levels)
+
+    def __getitem__(self, i):
+        if self.spill_dir is None:
+            return self._levels[i]
+        with open(self._levels[i], 'rb') as f:
+            return pickle.load(f)
+
+def product_tree(moduli, spill_dir=None):
+    """
+    Bottom-up tree of products: level 0 is the moduli, each level above
+    holds products of adjacent pairs, and the last level is [product].
+    """
+    levels = _Levels(spill_dir)
+    level = [gmpy2.mpz(n) for n in moduli] if gmpy2 else list(moduli)
+    levels.append(level)
+    while len(level) > 1:
+        level = [level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+        levels.append(level)
+    return levels
+
+def remainder_tree(levels):
+    """
+    Pushes the root product back down the tree, reducing modulo each
+    node squared. Returns (product mod n^2) for each leaf n.
+    """
+    remainders = levels[len(levels) - 1]
+    for i in range(len(levels) - 2, -1, -1):
+        level = levels[i]
+        remainders = [_mod(remainders[j // 2], x * x) for j, x in enumerate(level)]
+    return remainders
+
+def batch_gcd(moduli, spill_dir=None):
+    """
+    Bernstein's batch GCD: for each modulus n, gcd(n, product of all the
+    others), computed in quasi-linear time with a product tree and a
+    remainder tree. With spill_dir, tree levels are written there
+    instead of all being held in memory at once.
+    """
+    moduli = list(moduli)
+    if not moduli:
+        return []
+    levels = product_tree(moduli, spill_dir)
+    remainders = remainder_tree(levels)
+    return [int(gcd(r // n, n)) for r, n in zip(remainders, moduli)]
+
+def find_shared_primes(moduli, spill_dir=None):
+    """
+    Finds moduli that share a prime with another modulus in the list.
+    Returns (index, n, p, q) for each compromised modulus, with n = p * q.
+    Duplicated moduli, whose batch gcd is n itself, are split by
+    comparing them with the other compromised moduli; if that fails
+    too (an exact duplicate), p and q are None.
+    """
+    moduli = list(moduli)
+    divisors = batch_gcd(moduli, spill_dir)
+    weak = [i for i, g in enumerate(divisors) if g != 1]
+
+    found = []
+    for i in weak:
+        n, g = moduli[i], divisors[i]
+        if g == n:
+            g = next((h for h in (gcd(n, moduli[j]) for j in weak if j != i) if 1 < h < n), n)
+        if g == n:
+            found.append((i, n, None, None))
+        else:
+            found.append((i, n, g, n // g))
+    return found
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find RSA moduli that share a prime factor.")
+    parser.add_argument("path", help="file with one modulus per line (decimal or 0x hex)")
+    parser.add_argument("--spill", action="store_true",
+                        help="write product-tree levels to a temporary directory instead of memory")
+    parser.add_argument("--spill-dir", help="directory for spilled tree levels (implies --spill)")
+    args = parser.parse_args(argv)
+
+    entries = read_moduli(args.path)
+    if gmpy2 is None and len(entries) > LARGE_SCAN:
+        print(f"warning: gmpy2 is not installed; {len(entries)} moduli will take a long time "
+              f"with Python's own big-int arithmetic (pip install gmpy2)", file=sys.stderr)
+    spill_dir = args.spill_dir
+    cleanup = None
+    if args.spill and spill_dir is None:
+        spill_dir = cleanup = tempfile.mkdtemp(prefix="batch-gcd-")
+    try:
+        found = find_shared_primes([n for _, n in entries], spill_dir)
+    finally:
+        if cleanup:
+            shutil.rmtree(cleanup, ignore_errors=True)
+
+    for i, n, p, q in found:
+        line_number = entries[i][0]
+        if p is None:
+            print(f"line {line_number}: duplicate modulus {n}")
+        else:
+            print(f"line {line_number}: n={n} p={p} q={q}")
+    print(f"{len(found)} of {len(entries)} moduli compromised", file=sys.stderr)
+    return 1 if found else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import rsa_lib
+
+class Case:
+    """
+    One benchmark: setup() builds fresh arguments outside the timed
+    region, then func(*args) is timed. repeat is the default number of
+    measured runs, after warmup untimed ones.
+    """
+
+    def __init__(self, name, func, setup=tuple, repeat=20):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.repeat = repeat
+
+def _seeded_prime(bits, seed):
+    return rsa_lib.generate_prime(bits, random.Random(seed))
+
+def _seeded_composite(bits, seed):
+    """Product of two primes: survives trial division, fails Miller-Rabin."""
+    rng = random.Random(seed)
+    return rsa_lib.generate_prime(bits // 2, rng) * rsa_lib.generate_prime(bits - bits // 2, rng)
+
+def _message(length, seed=0):
+    rng = random.Random(seed)
+    return ''.join(chr(rng.randrange(32, 127)) for _ in range(length))
+
+def build_cases(quick=False):
+    """All benchmark cases; quick keeps to the smaller sizes."""
+    key_bits = (64, 256, 512, 1024) if quick else (64, 256, 512, 1024, 2048)
+    cases = []
+
+    for bits in key_bits:
+        heavy = bits >= 1024
+        cases.append(Case(f"generate_prime/{bits // 2}", rsa_lib.generate_prime, lambda b=bits: (b // 2,),
+                          repeat=10 if heavy else 30))
+        cases.append(Case(f"generate_keypair/{bits}", rsa_lib.generate_keypair, lambda b=bits: (b,),
+                          repeat=5 if heavy else 20))
+        if heavy:
+            for primes in (3, 4):
+                cases.append(Case(f"generate_keypair/{bits}/{primes}-prime", rsa_lib.generate_keypair,
+                                  lambda b=bits, k=primes: (b, random, k), repeat=5))
+
+    for bits in (256, 1024) if quick else (256, 1024, 2048):
+        prime = _seeded_prime(bits, bits)
+        composite = _seeded_composite(bits, bits)
+        cases.append(Case(f"is_prime/prime/{bits}", rsa_lib.is_prime, lambda p=prime: (p,)))
+        cases.append(Case(f"is_prime/composite/{bits}", rsa_lib.is_prime, lambda c=composite: (c,)))
+
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(1024, random.Random(1024))
+    for length in (64, 1024) if quick else (64, 1024, 16384):
+        message = _message(length)
+        for mode in ('char', 'block'):
+            cipher = rsa_lib.encrypt_message(public_key, message, mode)
+
+            def cold(*args):
+                # Per-character results would otherwise come from the codebook
+                rsa_lib.CODEBOOK.clear()
+                return args
+
+            cases.append(Case(f"encrypt/{mode}/{length}", rsa_lib.encrypt_message,
+                              lambda m=message, mode=mode: cold(public_key, m, mode), repeat=10))
+            cases.append(Case(f"decrypt/{mode}/{length}", rsa_lib.decrypt_message,
+                              lambda c=cipher, mode=mode: cold(private_key, c, mode), repeat=10))
+
+    payload = random.Random(1).randbytes(1 << 22)
+    sealed = rsa_lib.hybrid_encrypt(public_key, payload)
+    cases.append(Case("hybrid_encrypt/1024/4MiB", rsa_lib.hybrid_encrypt, lambda: (public_key, payload), repeat=3))
+    cases.append(Case("hybrid_decrypt/1024/4MiB", rsa_lib.hybrid_decrypt, lambda: (private_key, sealed), repeat=3))
+
+    records = [_message(64, i) for i in range(1000)]
+    signed = [(record, rsa_lib.sign(private_key, record)) for record in records]
+    cases.append(Case("sign/1024", rsa_lib.sign, lambda: (private_key, records[0]), repeat=50))
+    cases.append(Case("verify_batch/1024/1000", rsa_lib.verify_batch, lambda: (public_key, signed), repeat=10))
+
+    rng = random.Random(0)
+    for bits in (512, 1024):
+        a, b = rng.getrandbits(bits), rng.getrandbits(bits)
+        cases.append(Case(f"extended_gcd/{bits}", rsa_lib.extended_gcd, lambda a=a, b=b: (a, b), repeat=200))
+    for bits in (1024,) if quick else (1024, 2048):
+        *_, key_phi = rsa_lib.generate_keypair(bits, random.Random(bits))
+        cases.append(Case(f"mod_inverse/{bits}", rsa_lib.mod_inverse, lambda phi=key_phi: (65537, phi), repeat=200))
+
+    return cases
+
+def measure(case, warmup=2, repeat=None):
+    """Runs a case and returns its timing summary in seconds."""
+    repeat = repeat or case.repeat
+    for _ in range(warmup):
+        case.func(*case.setup())
+    samples = []
+    for _ in range(repeat):
+        args = case.setup()
+        start = time.perf_counter()
+        case.func(*args)
+        samples.append(time.perf_counter() - start)
+    p95 = statistics.quantiles(samples, n=20)[18] if len(samples) > 1 else samples[0]
+    return {
+        "median": statistics.median(samples),
+        "p95": p95,
+        "min": min(samples),
+        "runs": len(samples),
+    }
+
+def run(cases, warmup=2, repeat=None, seed=0, log=None):
+    """Measures every case with the global RNG reseeded for each one."""
+    results = {}
+    for case in cases:
+        random.seed(seed)
+        results[case.name] = measure(case, warmup, repeat)
+        if log:
+            log(f"{case.name:32} median {results[case.name]['median'] * 1e3:10.3f} ms"
+                f"   p95 {results[case.name]['p95'] * 1e3:10.3f} ms")
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Compares medians of the cases present in both reports.
+    Returns a list of (name, baseline_median, current_median, ratio)
+    for cases that got slower by more than threshold (0.2 = 20%).
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or before["median"] <= 0:
+            continue
+        ratio = result["median"] / before["median"]
+        if ratio > 1 + threshold:
+            regressions.append((name, before["median"], result["median"], ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark rsa_lib and track regressions.")
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed runs per case")
+    parser.add_argument("--repeat", type=int, help="timed runs per case (default: per case)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the global RNG")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if slower than this JSON report")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown of the median before failing (default 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in build_cases(args.quick) if args.filter in case.name]
+    log = lambda line: print(line, file=sys.stderr)
+    report = run(cases, args.warmup, args.repeat, args.seed, log)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for name, before, after, ratio in regressions:
+            log(f"REGRESSION {name}: {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        log(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import math
+import random
+import time
+
+import rsa_lib
+
+# Share of the time budget given to Pollard rho before trying p - 1
+RHO_SHARE = 0.75
+
+def trial_division(n, primes=None):
+    """
+    Returns the smallest prime factor of n found in the small-prime
+    table, or None if n has none.
+    """
+    if n % 2 == 0:
+        return 2
+    for p in primes or rsa_lib.SMALL_PRIMES:
+        if p * p > n:
+            break
+        if n % p == 0:
+            return p
+    return None
+
+class _Clock:
+    """Deadline, cancellation and progress reporting shared by the stages."""
+
+    # Minimum seconds between progress callbacks
+    REPORT_INTERVAL = 0.1
+
+    def __init__(self, budget, progress, cancel):
+        self.start = time.perf_counter()
+        self.budget = budget
+        self.progress = progress
+        self.cancel = cancel
+        self._reported = self.start
+
+    def expired(self, stage, share=1.0):
+        """Reports progress; True once the stage's share of the budget is spent or cancel is set."""
+        now = time.perf_counter()
+        elapsed = now - self.start
+        if self.progress is not None and now - self._reported >= self.REPORT_INTERVAL:
+            self._reported = now
+            self.progress(stage, min(elapsed / self.budget, 1.0))
+        if self.cancel is not None and self.cancel.is_set():
+            return True
+        return elapsed >= self.budget * share
+
+def pollard_rho(n, clock, share=1.0, batch=128):
+    """
+    Pollard's rho with Brent's cycle detection. Differences are
+    multiplied together and checked with one gcd per batch steps.
+    Returns a nontrivial factor, or None when time runs out.
+    """
+    while True:
+        c = random.randrange(1, n - 1)
+        y = random.randrange(0, n - 1)
+        r, q, g = 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += batch
+                if g == 1 and clock.expired("pollard-rho", share):
+                    return None
+            r *= 2
+        if g == n:
+            # The batch overshot; step through it one gcd at a time
+            while True:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        if g != n:
+            return g
+        # Unlucky polynomial: start over with a new c
+
+def pollard_p_minus_1(n, clock, bound=1_000_000, batch=256):
+    """
+    Pollard's p - 1, stage one: finds p when p - 1 is bound-smooth.
+    Returns a nontrivial factor, or None.
+    """
+    a = 2
+    primes = rsa_lib.primes_below(bound)
+    for i, p in enumerate(primes, 1):
+        a = pow(a, p ** int(math.log(bound, p)), n)
+        if i % batch == 0 or i == len(primes):
+            g = math.gcd(a - 1, n)
+            if 1 < g < n:
+                return g
+            if g == n or clock.expired("pollard-p-1"):
+                return None
+    return None
+
+def factor(n, budget=10.0, progress=None, cancel=None):
+    """
+    Finds a nontrivial factor of n: trial division by the small-prime
+    table, then Pollard rho (Brent) and then Pollard p - 1. Gives up
+    and returns None when n is prime, the wall-clock budget (seconds)
+    is spent, or cancel (e.g. a threading.Event) is set.
+    progress, if given, is called as progress(stage, fraction_of_budget).
+    """
+    if n < 4 or rsa_lib.is_prime(n):
+        return None
+    p = trial_division(n)
+    if p is not None:
+        return p
+    root = math.isqrt(n)
+    if root * root == n:
+        return root
+
+    clock = _Clock(budget, progress, cancel)
+    p = pollard_rho(n, clock, share=RHO_SHARE)
+    if p is None and not clock.expired("pollard-p-1"):
+        p = pollard_p_minus_1(n, clock)
+    return p
+
+def factor_completely(n, budget=10.0, progress=None, cancel=None):
+    """
+    Splits n into its prime factors with factor, sharing one time budget
+    across the splits. Returns the sorted list of primes, or None if
+    time ran out first.
+    """
+    deadline = time.perf_counter() + budget
+    primes = []
+    pending = [n]
+    while pending:
+        m = pending.pop()
+        if rsa_lib.is_prime(m):
+            primes.append(m)
+            continue
+        remaining = deadline - time.perf_counter()
+        p = factor(m, remaining, progress, cancel) if remaining > 0 else None
+        if p is None:
+            return None
+        pending += [p, m // p]
+    return sorted(primes)
+
+def recover_private_key(public_key, budget=10.0, progress=None, cancel=None):
+    """
+    Breaks a public key (e, n) by factoring n completely, so multi-prime
+    keys are recovered too. Returns (p, q, ..., d), or None if n could
+    not be factored in time.
+    """
+    e, n = public_key
+    primes = factor_completely(n, budget, progress, cancel)
+    if primes is None:
+        return None
+    phi = 1
+    for p in primes:
+        phi *= p - 1
+    return (*primes, rsa_lib.mod_inverse(e, phi))
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+from collections import deque
+
+import rsa_lib
+
+# Key sizes offered by the Key Generation page
+KEY_SIZES = (8, 16, 32, 64, 128, 256, 512, 1024)
+
+def _generate(bits):
+    """Generates a key pair, returning it with the metrics recorded on the way."""
+    with rsa_lib.collect_metrics() as metrics:
+        keypair = rsa_lib.generate_keypair(bits)
+    return keypair, metrics
+
+class KeyPool:
+    """
+    Keeps ready-made key pairs for each key size so a request can be
+    served instantly. A background thread tops each size back up to its
+    target after keys are taken; with workers > 1 the refill fans the
+    prime searches out over a process pool via generate_keypairs.
+
+    target is either one count for every size or a {bits: count} dict.
+    If path is given, unused keys are saved there as JSON and loaded
+    again on start-up, so the pool is warm after a restart.
+    """
+
+    def __init__(self, sizes=KEY_SIZES, target=2, path=None, workers=1):
+        self.sizes = tuple(sizes)
+        self.target = target
+        self.path = path
+        self.workers = workers
+        self._keys = {bits: deque() for bits in self.sizes}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        if path:
+            self._load()
+        self._thread = threading.Thread(target=self._refill_loop, name="key-pool", daemon=True)
+        self._thread.start()
+
+    def _target(self, bits):
+        if isinstance(self.target, dict):
+            return self.target.get(bits, 0)
+        return self.target
+
+    def get(self, bits):
+        """
+        Returns ((e, n), (d, n), p, q, phi) for the given size, taken from
+        the pool when one is ready and generated on the spot otherwise.
+        """
+        return self.take(bits)[0]
+
+    def take(self, bits):
+        """
+        Like get, but returns (keypair, metrics) where metrics is the
+        rsa_lib.Metrics recorded while the key was generated, or None for
+        keys generated in worker processes or loaded from the file.
+        """
+        with self._lock:
+            keys = self._keys.get(bits)
+            entry = keys.popleft() if keys else None
+        if entry is None:
+            return _generate(bits)
+        # Served keys must not survive in the file and be handed out again
+        self._save()
+        self._wakeup.set()
+        return entry
+
+    def available(self, bits):
+        """Number of ready key pairs of the given size."""
+        with self._lock:
+            return len(self._keys.get(bits, ()))
+
+    def stop(self):
+        """Stops the refill thread after its current key."""
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _deficit(self):
+        """Smallest size below its target and how many keys it is short."""
+        with self._lock:
+            for bits in sorted(self.sizes):
+                missing = self._target(bits) - len(self._keys[bits])
+                if missing > 0:
+                    return bits, missing
+        return None, 0
+
+    def _refill_loop(self):
+        while not self._stopped.is_set():
+            bits, missing = self._deficit()
+            if bits is None:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            if self.workers > 1 and missing > 1:
+                batch = ((keypair, None) for keypair in
+                         rsa_lib.generate_keypairs(missing, bits, workers=self.workers))
+            else:
+                batch = [_generate(bits)]
+            for entry in batch:
+                with self._lock:
+                    self._keys[bits].append(entry)
+                if self._stopped.is_set():
+                    break
+            self._save()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        for bits, entries in stored.items():
+            bits = int(bits)
+            if bits in self._keys:
+                for *primes, e in entries:
+                    self._keys[bits].append((rsa_lib.keypair_from_factors(primes, e), None))
+
+    def _save(self):
+        if not self.path:
+            return
+        with self._lock:
+            # Each key as its primes followed by e
+            stored = {
+                str(bits): [[*keypair[2:-1], keypair[0][0]] for keypair, metrics in keys]
+                for bits, keys in self._keys.items()
+            }
+            tmp = f"{self.path}.tmp"
+            # These are private keys: create the file readable by its owner only,
+            # replacing any stale temporary file rather than inheriting its mode
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as f:
+                json.dump(stored, f)
+            os.replace(tmp, self.path)
@@ -0,0 +1,195 @@
+import heapq
+import mmap
+import os
+import struct
+
+import rsa_lib
+
+# Data file: a header, then one fixed-width record per key in the order
+# added. Header fields: magic, format version, primes per record, width
+# (bytes per number). Record: public key fingerprint, then e and each
+# prime as width-byte big-endian integers; keys with fewer primes than
+# the record has room for leave the rest zero. Version 1 files always
+# held two primes and left that header byte zero.
+_DATA_HEADER = struct.Struct('>4sBBH')
+_DATA_MAGIC = b'RSAK'
+_VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+
+# Index file (path + ".idx"): a header, then (fingerprint, record number)
+# entries sorted by fingerprint, so a lookup is a binary search.
+_INDEX_HEADER = struct.Struct('>4sBxxx')
+_INDEX_MAGIC = b'RSAI'
+_INDEX_ENTRY = struct.Struct('>16sQ')
+
+# Width of new keystores: room for moduli up to 4096 bits
+DEFAULT_WIDTH = 512
+
+def _map(f):
+    """Read-only mmap of a whole file, or None while it is empty."""
+    size = os.fstat(f.fileno()).st_size
+    return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) if size else None
+
+class Keystore:
+    """
+    Key pairs on disk as fixed-width binary records plus a sorted
+    fingerprint index. Both files are memory-mapped, so looking one key
+    up among millions reads a few index pages and one record instead
+    of parsing the file.
+
+    Keys are stored as e and their primes; get rebuilds the key pair,
+    with its CRT parameters, from those. width (bytes per number) and
+    primes (most primes per key) only apply when the file is created.
+    """
+
+    def __init__(self, path, width=DEFAULT_WIDTH, primes=2):
+        self.path = path
+        self.index_path = path + ".idx"
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(_DATA_HEADER.pack(_DATA_MAGIC, _VERSION, primes, width))
+        self._data = open(path, 'r+b')
+        magic, version, self.primes, self.width = _DATA_HEADER.unpack(self._data.read(_DATA_HEADER.size))
+        if magic != _DATA_MAGIC or version not in _READABLE_VERSIONS:
+            self._data.close()
+            raise ValueError(f"{path} is not a keystore this version can read")
+        if version == 1:
+            self.primes = 2
+        self.record_size = 16 + (1 + self.primes) * self.width
+        self._records = None
+        self._index = None
+        self._index_file = None
+        if not os.path.exists(self.index_path):
+            self.rebuild_index()
+        self._remap()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for handle in (self._records, self._index, self._index_file, self._data):
+            if handle is not None:
+                handle.close()
+        self._records = self._index = self._index_file = None
+
+    def _remap(self):
+        for handle in (self._records, self._index, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._records = _map(self._data)
+        self._index_file = open(self.index_path, 'rb')
+        self._index = _map(self._index_file)
+        magic, version = _INDEX_HEADER.unpack(self._index[:_INDEX_HEADER.size])
+        if magic != _INDEX_MAGIC or version not in _READABLE_VERSIONS:
+            raise ValueError(f"{self.index_path} is not a keystore index this version can read")
+
+    def __len__(self):
+        return (len(self._index) - _INDEX_HEADER.size) // _INDEX_ENTRY.size
+
+    def _entry(self, i):
+        return _INDEX_ENTRY.unpack_from(self._index, _INDEX_HEADER.size + i * _INDEX_ENTRY.size)
+
+    def _find(self, fingerprint):
+        """Record number for a fingerprint, or None."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _INDEX_HEADER.size + mid * _INDEX_ENTRY.size
+            if self._index[offset:offset + 16] < fingerprint:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self):
+            found, record = self._entry(lo)
+            if found == fingerprint:
+                return record
+        return None
+
+    def _entries(self):
+        """Index entries as (fingerprint, record number), in order."""
+        for i in range(len(self)):
+            yield self._entry(i)
+
+    def __contains__(self, key):
+        return self._find(_fingerprint(key)) is not None
+
+    def get(self, key):
+        """
+        Looks a key pair up by public key or 16-byte fingerprint.
+        Returns ((e, n), (d, n), p, q, ..., phi), or None if it is not stored.
+        """
+        record = self._find(_fingerprint(key))
+        if record is None:
+            return None
+        offset = _DATA_HEADER.size + record * self.record_size + 16
+        e, *primes = (int.from_bytes(self._records[offset + i * self.width:offset + (i + 1) * self.width], 'big')
+                      for i in range(1 + self.primes))
+        return rsa_lib.keypair_from_factors([p for p in primes if p], e)
+
+    def add(self, keypairs):
+        """
+        Appends key pairs (as returned by generate_keypair) and merges
+        them into the index. Keys already stored are skipped. Adding in
+        batches is much cheaper than one at a time, as the index is
+        rewritten once per call. Returns the number of keys added.
+        """
+        new = {}
+        for public_key, private_key, *primes, phi in keypairs:
+            e, n = public_key
+            if max(e, n).bit_length() > self.width * 8:
+                raise ValueError(f"Key does not fit in a {self.width}-byte keystore")
+            if len(primes) > self.primes:
+                raise ValueError(f"Key has {len(primes)} primes; this keystore holds at most {self.primes}")
+            fingerprint = rsa_lib.key_fingerprint(public_key)
+            if fingerprint not in new and self._find(fingerprint) is None:
+                new[fingerprint] = [e, *primes] + [0] * (self.primes - len(primes))
+        if not new:
+            return 0
+
+        first = self._record_count()
+        self._data.seek(0, os.SEEK_END)
+        entries = []
+        for i, (fingerprint, numbers) in enumerate(new.items()):
+            self._data.write(fingerprint + b''.join(x.to_bytes(self.width, 'big') for x in numbers))
+            entries.append((fingerprint, first + i))
+        self._data.flush()
+        entries.sort()
+        self._write_index(heapq.merge(self._entries(), entries))
+        return len(entries)
+
+    def _record_count(self):
+        return (os.fstat(self._data.fileno()).st_size - _DATA_HEADER.size) // self.record_size
+
+    def rebuild_index(self):
+        """Rebuilds the index file from the data file."""
+        count = self._record_count()
+        records = _map(self._data)
+        try:
+            entries = sorted(
+                (bytes(records[offset:offset + 16]), i)
+                for i, offset in enumerate(range(_DATA_HEADER.size, _DATA_HEADER.size + count * self.record_size,
+                                                 self.record_size))
+            )
+        finally:
+            if records is not None:
+                records.close()
+        self._write_index(entries)
+
+    def _write_index(self, entries):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _VERSION))
+            for fingerprint, record in entries:
+                f.write(_INDEX_ENTRY.pack(fingerprint, record))
+        os.replace(tmp, self.index_path)
+        if self._index is not None:
+            self._remap()
+
+def _fingerprint(key):
+    """A 16-byte fingerprint as is, or the fingerprint of a public key."""
+    if isinstance(key, (bytes, bytearray)):
+        return bytes(key)
+    return rsa_lib.key_fingerprint(key)
@@ -1,9 +1,178 @@
+import os
 import random
+import sys
 import hashlib
+import hmac
+import io
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import total_ordering
+from itertools import compress
+from math import isqrt, lcm
 
-def is_prime(n, k=5):
+class Metrics:
     """
-    Miller-Rabin primality test.
+    Counters and per-phase timings recorded by rsa_lib while a
+    collect_metrics() block is active. Counters: candidates (numbers
+    sent to is_prime during prime search), mr_rounds, lucas_tests,
+    e_retries and modexp (RSA operations in encrypt/decrypt). Timings
+    are seconds per phase of key generation.
+    """
+
+    def __init__(self):
+        self.counters = dict.fromkeys(('candidates', 'mr_rounds', 'lucas_tests', 'e_retries', 'modexp'), 0)
+        self.timings = {}
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def lap(self, phase, since):
+        """Adds the time since a perf_counter() reading to phase; returns the new reading."""
+        now = time.perf_counter()
+        self.timings[phase] = self.timings.get(phase, 0.0) + now - since
+        return now
+
+    def as_dict(self):
+        return {'counters': dict(self.counters), 'timings': dict(self.timings)}
+
+    def to_prometheus(self, prefix='rsa_lib'):
+        """Renders the metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        lines.append(f"# TYPE {prefix}_phase_seconds gauge")
+        for phase, seconds in self.timings.items():
+            lines.append(f'{prefix}_phase_seconds{{phase="{phase}"}} {seconds:.9f}')
+        return "\n".join(lines) + "\n"
+
+# Metrics of the innermost active collect_metrics() block, per thread/task
+_ACTIVE_METRICS = ContextVar('rsa_lib_metrics', default=None)
+_METRICS_HOOKS = []
+
+@contextmanager
+def collect_metrics():
+    """
+    Records rsa_lib counters and timings for the code in the block:
+
+        with rsa_lib.collect_metrics() as metrics:
+            rsa_lib.generate_keypair(1024)
+        print(metrics.as_dict())
+
+    When no block is active the instrumentation costs one context
+    variable lookup per call. Hooks registered with add_metrics_hook
+    receive the Metrics object when the block exits.
+    """
+    metrics = Metrics()
+    token = _ACTIVE_METRICS.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _ACTIVE_METRICS.reset(token)
+        for hook in list(_METRICS_HOOKS):
+            hook(metrics)
+
+def add_metrics_hook(callback):
+    """Calls callback(metrics) at the end of every collect_metrics() block."""
+    _METRICS_HOOKS.append(callback)
+
+def remove_metrics_hook(callback):
+    _METRICS_HOOKS.remove(callback)
+
+def _sieve(limit):
+    """Sieve of Eratosthenes: flags[i] is 1 exactly when i is prime."""
+    flags = bytearray([1]) * limit
+    flags[:2] = b'\x00\x00'
+    for i in range(2, isqrt(limit - 1) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return flags
+
+def primes_below(limit):
+    """All primes below limit."""
+    return list(compress(range(limit), _sieve(limit)))
+
+# Primality lookup table for n < 2^16
+_SMALL_LIMIT = 1 << 16
+_SMALL_SIEVE = _sieve(_SMALL_LIMIT)
+
+# Odd primes below 2^14 (about 1900 of them) for prefiltering candidates
+SMALL_PRIMES = primes_below(1 << 14)[1:]
+
+# Product of the primes below 200, for a one-gcd trial division
+_SMALL_PRIMORIAL = 1
+for _p in primes_below(200):
+    _SMALL_PRIMORIAL *= _p
+del _p
+
+# Deterministic Miller-Rabin witness sets: (bound, bases) such that the
+# bases prove primality for every n < bound (Jaeschke; Jiang and Deng)
+_DETERMINISTIC_BASES = [
+    (1_373_653, (2, 3)),
+    (3_215_031_751, (2, 3, 5, 7)),
+    (3_474_749_660_383, (2, 3, 5, 7, 11, 13)),
+    (341_550_071_728_321, (2, 3, 5, 7, 11, 13, 17)),
+    (3_825_123_056_546_413_051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318_665_857_834_031_151_167_461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3_317_044_064_679_887_385_961_981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+]
+
+def is_prime(n, k=5, method='auto'):
+    """
+    Primality test.
+    Returns True if n is prime (or, in the probabilistic modes, likely
+    prime), False if composite.
+
+    method='auto' picks by size: a table lookup below 2^16, Miller-Rabin
+    with a deterministic witness set below 3.3 * 10^24 (exact), and
+    Baillie-PSW above that. None of these draw random numbers.
+    method='miller-rabin' runs k rounds with random bases, as before,
+    and method='bpsw' forces Baillie-PSW.
+    """
+    if n < _SMALL_LIMIT:
+        return n >= 0 and _SMALL_SIEVE[n] == 1
+    if method == 'miller-rabin':
+        return miller_rabin(n, k)
+    if gcd(n, _SMALL_PRIMORIAL) != 1:
+        return False
+    if method == 'bpsw':
+        return baillie_psw(n)
+    if method != 'auto':
+        raise ValueError(f"Unknown primality method: {method!r}")
+
+    for bound, bases in _DETERMINISTIC_BASES:
+        if n < bound:
+            d, r = _split_power_of_two(n - 1)
+            return all(_strong_probable_prime(n, a, d, r) for a in bases)
+    return baillie_psw(n)
+
+def _split_power_of_two(m):
+    """Write m as d * 2^r with d odd; returns (d, r)."""
+    r = (m & -m).bit_length() - 1
+    return m >> r, r
+
+def _strong_probable_prime(n, a, d, r):
+    """One Miller-Rabin round: is odd n a strong probable prime to base a?"""
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is not None:
+        metrics.count('mr_rounds')
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(r - 1):
+        x = pow(x, 2, n)
+        if x == n - 1:
+            return True
+    return False
+
+def miller_rabin(n, k=5):
+    """
+    Miller-Rabin primality test with k random bases.
     Returns True if n is likely prime, False if composite.
     """
     if n < 2: return False
@@ -11,37 +180,146 @@ def is_prime(n, k=5):
     if n % 2 == 0: return False
 
     # Write n-1 as 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
+    d, r = _split_power_of_two(n - 1)
 
     # Witness loop
     for _ in range(k):
         a = random.randrange(2, n - 1)
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
+        if not _strong_probable_prime(n, a, d, r):
             return False
     return True
 
-def generate_prime(bits):
+def jacobi(a, n):
+    """Jacobi symbol (a/n) for odd positive n."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def _strong_lucas_probable_prime(n):
+    """
+    Strong Lucas probable-prime test with Selfridge's parameters:
+    D is the first of 5, -7, 9, -11, ... with (D/n) = -1, P = 1 and
+    Q = (1 - D) / 4. n must be odd and not a perfect square.
+    """
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    # Walk the bits of d, where n + 1 = d * 2^s, keeping U_k, V_k and Q^k
+    d, s = _split_power_of_two(n + 1)
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, V = P * U + V, D * U + P * V
+            # Halve modulo n (n is odd, so adding n makes the value even)
+            U = (U + n if U & 1 else U) // 2 % n
+            V = (V + n if V & 1 else V) // 2 % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+def baillie_psw(n):
+    """
+    Baillie-PSW test: a strong base-2 Miller-Rabin round followed by a
+    strong Lucas test. No composite is known to pass both.
+    """
+    if n < 2: return False
+    if n % 2 == 0: return n == 2
+    if n < 9: return True
+    d, r = _split_power_of_two(n - 1)
+    if not _strong_probable_prime(n, 2, d, r):
+        return False
+    if isqrt(n) ** 2 == n:
+        return False
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is not None:
+        metrics.count('lucas_tests')
+    return _strong_lucas_probable_prime(n)
+
+
+class CandidateSieve:
+    """
+    Incremental sieve over odd candidates start, start + 2, start + 4, ...
+    Keeps start mod each small prime and advances those residues one
+    window at a time, so candidates with a small factor are discarded
+    without ever dividing the big number again. Iterating yields the
+    survivors in increasing order, indefinitely.
+    """
+
+    def __init__(self, start, primes=SMALL_PRIMES, window=2048):
+        self.start = start | 1
+        self.primes = primes
+        self.window = window
+        self.residues = [self.start % s for s in primes]
+
+    def survivors(self):
+        """Candidates in the current window with no factor in primes."""
+        start, window = self.start, self.window
+        flags = bytearray([1]) * window
+        for r, s in zip(self.residues, self.primes):
+            # start + 2i = 0 (mod s)  <=>  i = -r * 2^-1 (mod s)
+            i = (-r * ((s + 1) >> 1)) % s
+            if start + 2 * i == s:
+                i += s  # s itself is prime, only strike its multiples
+            flags[i::s] = bytes(len(range(i, window, s)))
+        return [start + 2 * i for i in compress(range(window), flags)]
+
+    def advance(self):
+        """Move to the next window, updating residues incrementally."""
+        step = 2 * self.window
+        self.start += step
+        self.residues = [(r + step) % s for r, s in zip(self.residues, self.primes)]
+
+    def __iter__(self):
+        while True:
+            yield from self.survivors()
+            self.advance()
+
+def generate_prime(bits, rng=random):
     """
     Generate a random prime number with specified bit length.
+    Starts from a random odd number and searches upward through the
+    candidates that survive the small-prime sieve. Pass a seeded
+    random.Random as rng for reproducible output.
     """
+    metrics = _ACTIVE_METRICS.get()
     while True:
         # Generate random odd number
-        p = random.getrandbits(bits)
+        p = rng.getrandbits(bits)
         # Ensure it has the correct bit length and is odd
         p |= (1 << (bits - 1)) | 1
         
-        if is_prime(p):
-            return p
+        for candidate in CandidateSieve(p):
+            if candidate.bit_length() > bits:
+                break
+            if metrics is not None:
+                metrics.count('candidates')
+            if is_prime(candidate):
+                return candidate
 
 def gcd(a, b):
     """Compute the greatest common divisor of a and b."""
@@ -71,61 +349,985 @@ def mod_inverse(e, phi):
     else:
         return x % phi
 
-def generate_keypair(bits=1024):
+@total_ordering
+class _Key:
+    """
+    Shared behaviour of PublicKey and PrivateKey: each iterates, indexes,
+    compares, orders and hashes like the plain two-tuple it replaces, so
+    e, n = public_key and (d, n) == private_key keep working. Subclasses
+    supply that tuple as _pair().
+    """
+
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(self._pair())
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index):
+        return self._pair()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (tuple, _Key)):
+            return self._pair() == tuple(other)
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, (tuple, _Key)):
+            return self._pair() < tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._pair())
+
+class PublicKey(_Key):
+    """
+    Public key (e, n) with its byte length and fingerprint cached.
+    The fingerprint is computed on first use.
+    """
+
+    __slots__ = ('e', 'n', 'byte_length', '_fingerprint')
+
+    def __init__(self, e, n):
+        self.e = e
+        self.n = n
+        self.byte_length = (n.bit_length() + 7) // 8
+        self._fingerprint = None
+
+    def _pair(self):
+        return (self.e, self.n)
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = key_fingerprint((self.e, self.n))
+        return self._fingerprint
+
+    def __repr__(self):
+        return f"PublicKey(e={self.e}, n={self.n})"
+
+    def __reduce__(self):
+        return (PublicKey, (self.e, self.n))
+
+class PrivateKey(_Key):
+    """
+    Private key (d, n) carrying the CRT parameters of its primes.
+    Unpacks and compares like a plain (d, n) tuple, so existing callers
+    keep working; decrypt_message uses dp, dq and q_inv when present.
+
+    Multi-prime keys pass their further primes after p and q. As in
+    PKCS #1, each extra prime r gets (r, d mod (r - 1), t), where t is
+    the inverse of the product of the primes before it, modulo r.
+    Raises ValueError if the primes do not multiply to n.
+    """
+
+    __slots__ = ('d', 'n', 'p', 'q', 'dp', 'dq', 'q_inv', 'primes', 'others', 'byte_length')
+
+    def __init__(self, d, n, p, q, *others):
+        product = p * q
+        for r in others:
+            product *= r
+        if product != n:
+            raise ValueError("The primes of a private key must multiply to n")
+        self.d = d
+        self.n = n
+        self.p = p
+        self.q = q
+        self.dp = d % (p - 1)
+        self.dq = d % (q - 1)
+        self.q_inv = mod_inverse(q, p)
+        self.primes = (p, q) + others
+        self.others = []
+        product = p * q
+        for r in others:
+            self.others.append((r, d % (r - 1), mod_inverse(product % r, r)))
+            product *= r
+        self.others = tuple(self.others)
+        self.byte_length = (n.bit_length() + 7) // 8
+
+    def _pair(self):
+        return (self.d, self.n)
+
+    def __repr__(self):
+        return f"PrivateKey(d=..., n={self.n})"
+
+    def __reduce__(self):
+        return (PrivateKey, (self.d, self.n) + self.primes)
+
+def byte_length(key):
+    """Byte length of a key's modulus, cached on PublicKey/PrivateKey objects."""
+    if isinstance(key, _Key):
+        return key.byte_length
+    return (key[1].bit_length() + 7) // 8
+
+# Search-phase names for each prime in the metrics, as in PKCS #1: p, q, r3, r4, ...
+def _prime_phase(i):
+    return ('prime_p', 'prime_q')[i] if i < 2 else f'prime_r{i + 1}'
+
+def generate_keypair(bits=1024, rng=random, primes=2):
     """
     Generates a public/private key pair.
     Returns ((e, n), (d, n), p, q, phi)
+
+    With primes=k > 2, n is the product of k distinct primes of
+    bits // k bits each, which are much quicker to find than two of
+    bits // 2, and decryption does k smaller exponentiations.
+    The primes then all follow the private key: ((e, n), (d, n), p, q, r3, ..., phi).
     """
-    # 1. Generate p and q
-    p = generate_prime(bits // 2)
-    q = generate_prime(bits // 2)
-    
-    # Ensure p != q
-    while p == q:
-        q = generate_prime(bits // 2)
+    _check_prime_count(bits, primes)
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is not None:
+        started = time.perf_counter()
+
+    # 1. Generate p and q (and any further primes), all distinct
+    factors = []
+    while len(factors) < primes:
+        prime = generate_prime(bits // primes, rng)
+        if prime in factors:
+            continue
+        factors.append(prime)
+        if metrics is not None:
+            started = metrics.lap(_prime_phase(len(factors) - 1), started)
+
+    return keypair_from_factors(factors, rng=rng)
+
+def _check_prime_count(bits, primes):
+    if primes < 2:
+        raise ValueError("A key needs at least two primes")
+    if primes > 2 and bits // primes < 8:
+        raise ValueError(f"{bits}-bit keys are too small for {primes} primes (need 8 bits per prime)")
+
+def keypair_from_primes(p, q, e=65537, rng=random):
+    """
+    Builds a key pair from two distinct primes.
+    Returns ((e, n), (d, n), p, q, phi), like generate_keypair.
+    """
+    return keypair_from_factors((p, q), e, rng)
+
+def keypair_from_factors(factors, e=65537, rng=random):
+    """
+    Builds a key pair from two or more distinct primes.
+    Returns ((e, n), (d, n), *factors, phi), like generate_keypair.
+    """
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is not None:
+        started = time.perf_counter()
 
     # 2. Compute n
-    n = p * q
+    n = 1
+    for prime in factors:
+        n *= prime
 
     # 3. Compute phi(n)
-    phi = (p - 1) * (q - 1)
+    phi = 1
+    for prime in factors:
+        phi *= prime - 1
+    if metrics is not None:
+        started = metrics.lap('modulus_totient', started)
 
     # 4. Choose e
     # Common choice is 65537 (2^16 + 1)
-    e = 65537
     
     # Ensure gcd(e, phi) == 1. If not, pick another e (rare for 65537 but good to check)
     # Or just regenerate p, q. For this demo, we'll just check.
     # If 65537 shares a factor, we can just increment or pick random odd.
     while gcd(e, phi) != 1:
-        e = random.randrange(3, phi, 2)
+        e = rng.randrange(3, phi, 2)
+        if metrics is not None:
+            metrics.count('e_retries')
+    if metrics is not None:
+        started = metrics.lap('choose_e', started)
 
     # 5. Compute d
     d = mod_inverse(e, phi)
+    if metrics is not None:
+        started = metrics.lap('mod_inverse', started)
 
     # Return public and private key parts
     # Public: (e, n)
-    # Private: (d, n)
-    return ((e, n), (d, n), p, q, phi)
+    # Private: (d, n), with CRT parameters attached
+    private_key = PrivateKey(d, n, *factors)
+    if metrics is not None:
+        metrics.lap('crt_params', started)
+    return (PublicKey(e, n), private_key, *factors, phi)
+
+def _search_prime(bits, seed):
+    """Process pool task: find one prime from its own random stream."""
+    # A fresh Random per task; forked workers would otherwise share state
+    return generate_prime(bits, random.Random(seed))
+
+def generate_keypairs(count, bits=1024, workers=None, seed=None, primes=2):
+    """
+    Generates count key pairs, spreading the prime searches over a
+    process pool. Yields ((e, n), (d, n), p, q, phi) tuples as they
+    complete, which is not necessarily request order. primes works as
+    in generate_keypair.
+
+    When there are more workers than keys, several searches race for
+    each key's primes and the first distinct ones win, so even
+    generate_keypairs(1, 2048) keeps every core busy. With a seed, each
+    key uses exactly one seeded search per prime and the same seed
+    always produces the same keys.
+    """
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+    _check_prime_count(bits, primes)
+    workers = workers or os.cpu_count() or 1
+    racers = primes if seed is not None else max(primes, workers // max(count, 1))
+    found = [[] for _ in range(count)]
+    attempts = [0] * count
+    pending = {}
+    pool = ProcessPoolExecutor(workers)
+
+    def submit(i):
+        task_seed = None if seed is None else f"{seed}:{i}:{attempts[i]}"
+        attempts[i] += 1
+        pending[pool.submit(_search_prime, bits // primes, task_seed)] = i
+
+    try:
+        for i in range(count):
+            for _ in range(racers):
+                submit(i)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = pending.pop(future)
+                factors = found[i]
+                if factors is None:
+                    continue  # a losing racer for a finished key
+                prime = future.result()
+                if prime in factors:
+                    submit(i)
+                    continue
+                factors.append(prime)
+                if len(factors) < primes:
+                    continue
+
+                # Key complete: drop the racers still queued for it
+                found[i] = None
+                for other, j in list(pending.items()):
+                    if j == i and other.cancel():
+                        del pending[other]
+                rng = random.Random(f"{seed}:{i}") if seed is not None else random
+                yield keypair_from_factors(sorted(factors, reverse=True), rng=rng)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
-def encrypt_message(public_key, message):
+def encrypt_message(public_key, message, mode='char', workers=None):
     """
     Encrypts a string message using the public key.
-    Returns a list of encrypted integers (one per character).
+    Returns a list of encrypted integers: one per character in 'char'
+    mode, or one per packed block of UTF-8 bytes in 'block' mode.
+    With workers, large inputs are spread over that many processes.
     """
-    e, n = public_key
-    cipher = [pow(ord(char), e, n) for char in message]
-    return cipher
+    if mode == 'block':
+        return encrypt_blocks(public_key, message, workers)
+    if mode != 'char':
+        raise ValueError(f"Unknown encryption mode: {mode!r}")
+    return CODEBOOK.encrypt(public_key, message, workers)
 
-def decrypt_message(private_key, ciphertext):
+def decrypt_message(private_key, ciphertext, mode='char', workers=None):
     """
     Decrypts a list of encrypted integers using the private key.
+    The mode must match the one used by encrypt_message.
+    With workers, large inputs are spread over that many processes.
+    Returns the plaintext string.
+    """
+    if mode == 'block':
+        return decrypt_blocks(private_key, ciphertext, workers)
+    if mode != 'char':
+        raise ValueError(f"Unknown encryption mode: {mode!r}")
+    return CODEBOOK.decrypt(private_key, ciphertext, workers)
+
+# Below this many values a process pool costs more than it saves
+PARALLEL_THRESHOLD = 2048
+
+# Key installed in each pool worker by _init_worker
+_worker_key = None
+
+def _init_worker(key):
+    global _worker_key
+    _worker_key = key
+
+def _public_chunk(values):
+    e, n = _worker_key
+    return [pow(m, e, n) for m in values]
+
+def _private_chunk(values):
+    return [_private_op(_worker_key, c) for c in values]
+
+# Below this modulus every product of two residues fits in a uint64
+VECTOR_MODULUS_LIMIT = 1 << 32
+# Fewer values than this are quicker through plain pow()
+VECTOR_MIN_SIZE = 64
+
+# numpy module once imported, False if it is not installed
+_np = None
+
+def _numpy():
+    """Imports NumPy on first use; returns None when it is unavailable."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _np = numpy
+    return _np or None
+
+def vector_pow(values, exponent, n):
+    """
+    Computes value^exponent mod n for a whole sequence (or NumPy array)
+    of values at once, by square-and-multiply over uint64 arrays.
+    Requires NumPy and n < 2^32, so that products stay below 2^64.
+    Returns a list of ints.
+    """
+    np = _numpy()
+    if np is None:
+        raise ImportError("vector_pow requires NumPy")
+    if not 1 < n < VECTOR_MODULUS_LIMIT:
+        raise ValueError("vector_pow requires 1 < n < 2^32")
+    modulus = np.uint64(n)
+    base = np.remainder(np.asarray(values, dtype=np.uint64), modulus)
+    result = np.ones_like(base)
+    while exponent:
+        if exponent & 1:
+            np.multiply(result, base, out=result)
+            np.remainder(result, modulus, out=result)
+        exponent >>= 1
+        if exponent:
+            np.multiply(base, base, out=base)
+            np.remainder(base, modulus, out=base)
+    return result.tolist()
+
+def _apply_key(key, values, private, workers=None):
+    """
+    Applies the key's RSA operation to each value, preserving order.
+    Small moduli (n < 2^32) go through the vectorized NumPy engine when
+    NumPy is installed. Otherwise a process pool is used when
+    workers > 1 and there are at least PARALLEL_THRESHOLD values; the
+    key is sent once per worker process rather than with every chunk.
+    """
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is not None:
+        metrics.count('modexp', len(values))
+
+    exponent, n = key
+    if n < VECTOR_MODULUS_LIMIT and len(values) >= VECTOR_MIN_SIZE and _numpy():
+        # Both (e, n) and (d, n) keys carry their exponent first
+        return vector_pow(values, exponent, n)
+
+    if not workers or workers < 2 or len(values) < PARALLEL_THRESHOLD:
+        if private:
+            return [_private_op(key, c) for c in values]
+        e, n = key
+        return [pow(m, e, n) for m in values]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # A few chunks per worker keeps them busy if some finish early
+    size = -(-len(values) // (workers * 4))
+    chunks = [values[i:i + size] for i in range(0, len(values), size)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(key,)) as pool:
+        parts = pool.map(_private_chunk if private else _public_chunk, chunks)
+        return [x for part in parts for x in part]
+
+class Codebook:
+    """
+    Memo of code point -> ciphertext for the per-character cipher.
+    The cipher is deterministic, so each distinct character only needs
+    one pow() per key. Tables are kept per public key (e, n) in LRU
+    order: using a new key evicts the least recently used one once
+    max_keys is reached.
+
+    Decryption only reads what encryption learned once the private key
+    is known to invert e: a PrivateKey whose d satisfies
+    e * d = 1 (mod lcm(p - 1, q - 1, ...)). Other private keys get
+    reverse tables of their own, kept per (d, n), so a wrong d never
+    reads another key's plaintexts.
+    """
+
+    def __init__(self, max_keys=8, max_entries=65536):
+        self.max_keys = max_keys
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._books = OrderedDict()
+        self._private = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _book(self, e, n):
+        """Return the (forward, reverse) tables for a public key."""
+        with self._lock:
+            return self._touch(self._books, (e, n), lambda: ({}, {}))
+
+    def _touch(self, books, key, new):
+        """LRU lookup in books, adding new() for an unknown key."""
+        if key not in books:
+            books[key] = new()
+            while len(books) > self.max_keys:
+                books.popitem(last=False)
+        books.move_to_end(key)
+        return books[key]
+
+    def _reverse_book(self, private_key):
+        """
+        (forward, reverse) tables decryption under private_key may use:
+        the tables of a cached public key it inverts, or its own reverse
+        table (with no forward table).
+        """
+        d, n = private_key
+        with self._lock:
+            if isinstance(private_key, PrivateKey):
+                order = lcm(*(r - 1 for r in private_key.primes))
+                for e, m in self._books:
+                    if m == n and e * d % order == 1:
+                        self._books.move_to_end((e, n))
+                        return self._books[(e, n)]
+            return None, self._touch(self._private, (d, n), dict)
+
+    def _store(self, forward, reverse, table):
+        """Add newly computed pairs while the key's tables have room."""
+        for m, c in table.items():
+            if len(reverse) >= self.max_entries:
+                break
+            if forward is not None:
+                forward[m] = c
+            reverse[c] = m
+
+    def _count(self, total, computed):
+        with self._lock:
+            self.hits += total - computed
+            self.misses += computed
+
+    def encrypt(self, public_key, message, workers=None):
+        """Encrypts a string character by character, reusing cached ciphertexts."""
+        e, n = public_key
+        forward, reverse = self._book(e, n)
+        table = {}
+        missing = []
+        for m in set(map(ord, message)):
+            c = forward.get(m)
+            if c is None:
+                missing.append(m)
+            else:
+                table[m] = c
+        new = dict(zip(missing, _apply_key(public_key, missing, False, workers)))
+        table.update(new)
+        # Code points >= n do not round-trip, so keep them out of the reverse table
+        self._store(forward, reverse, {m: c for m, c in new.items() if m < n})
+        self._count(len(message), len(new))
+        return [table[ord(char)] for char in message]
+
+    def decrypt(self, private_key, ciphertext, workers=None):
+        """Decrypts per-character ciphertext, looking up previously seen values."""
+        forward, reverse = self._reverse_book(private_key)
+        table = {}
+        missing = []
+        for c in set(ciphertext):
+            m = reverse.get(c)
+            if m is None:
+                missing.append(c)
+            else:
+                table[c] = m
+        new = dict(zip(missing, _apply_key(private_key, missing, True, workers)))
+        if new and max(new.values()) > sys.maxunicode:
+            raise ValueError("Ciphertext does not decrypt to characters (wrong key or mode?)")
+        table.update(new)
+        self._store(forward, reverse, {m: c for c, m in new.items()})
+        self._count(len(ciphertext), len(new))
+        return ''.join([chr(table[c]) for c in ciphertext])
+
+    def clear(self):
+        """Drop all cached tables and reset the counters."""
+        with self._lock:
+            self._books.clear()
+            self._private.clear()
+            self.hits = 0
+            self.misses = 0
+
+# Shared by encrypt_message/decrypt_message in per-character mode
+CODEBOOK = Codebook()
+
+def block_size(n):
+    """
+    Number of plaintext bytes packed into one block under modulus n.
+    One byte less than n's byte length, so every block is below n.
+    """
+    return (n.bit_length() + 7) // 8 - 1
+
+def encrypt_blocks(public_key, message, workers=None):
+    """
+    Encrypts a string by UTF-8 encoding it and packing the bytes into
+    blocks that fit under n, one modular exponentiation per block.
+    The message is padded with 0x80 followed by zero bytes so that
+    decryption can recover its exact length.
+    """
+    size = byte_length(public_key) - 1
+    if size < 1:
+        raise ValueError("Key is too small for block mode (n must be at least 256)")
+    data = message.encode('utf-8') + b'\x80'
+    data += bytes(-len(data) % size)
+    blocks = [int.from_bytes(data[i:i + size], 'big') for i in range(0, len(data), size)]
+    return _apply_key(public_key, blocks, False, workers)
+
+def decrypt_blocks(private_key, ciphertext, workers=None):
+    """
+    Decrypts a list of blocks produced by encrypt_blocks.
     Returns the plaintext string.
     """
+    size = byte_length(private_key) - 1
+    blocks = _apply_key(private_key, list(ciphertext), True, workers)
+    if blocks and max(blocks) >> (8 * size):
+        # Only a wrong key, the wrong mode or a tampered block decrypts this wide
+        raise ValueError("Invalid block padding")
+    data = b''.join([m.to_bytes(size, 'big') for m in blocks])
+    end = data.rstrip(b'\x00')
+    if not end.endswith(b'\x80'):
+        raise ValueError("Invalid block padding")
+    return end[:-1].decode('utf-8')
+
+# Plaintext bytes read per frame by encrypt_stream, and per read by compute_hash
+STREAM_CHUNK_SIZE = 1 << 16
+
+def _read_full(source, size):
+    """
+    Reads size bytes, or fewer only at end of file. Raw and unbuffered
+    streams may return short reads before that, so keep reading.
+    """
+    data = source.read(size)
+    if len(data) in (0, size):
+        return data
+    parts = [data]
+    remaining = size - len(data)
+    while remaining:
+        data = source.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b''.join(parts)
+
+def encrypt_stream(public_key, source, chunk_size=STREAM_CHUNK_SIZE, hasher=None):
+    """
+    Encrypts a binary file-like object (or mmap) chunk by chunk.
+    Yields one frame per chunk: the chunk's plaintext length as 4
+    big-endian bytes, then its blocks, each a fixed-width big-endian
+    integer of n's byte length. Only one chunk is held in memory at a
+    time. If hasher (e.g. hashlib.sha256()) is given, it is updated
+    with the plaintext as it is read.
+    """
+    e, n = public_key
+    size = byte_length(public_key) - 1
+    if size < 1:
+        raise ValueError("Key is too small for block mode (n must be at least 256)")
+    width = size + 1
+    chunk_size = max(size, chunk_size - chunk_size % size)
+
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if hasher is not None:
+            hasher.update(chunk)
+        frame = bytearray(len(chunk).to_bytes(4, 'big'))
+        metrics = _ACTIVE_METRICS.get()
+        if metrics is not None:
+            metrics.count('modexp', -(-len(chunk) // size))
+        if len(chunk) % size:
+            # Only the final chunk can be short; zero-fill its last block
+            chunk += bytes(-len(chunk) % size)
+        view = memoryview(chunk)
+        for i in range(0, len(chunk), size):
+            m = int.from_bytes(view[i:i + size], 'big')
+            frame += pow(m, e, n).to_bytes(width, 'big')
+        yield bytes(frame)
+
+def decrypt_stream(private_key, source, hasher=None):
+    """
+    Decrypts frames written by encrypt_stream from a binary file-like
+    object (or mmap), yielding the plaintext one chunk at a time.
+    If hasher is given, it is updated with the recovered plaintext.
+    """
+    size = byte_length(private_key) - 1
+    width = size + 1
+
+    while True:
+        header = _read_full(source, 4)
+        if not header:
+            break
+        if len(header) < 4:
+            raise ValueError("Truncated frame header")
+        length = int.from_bytes(header, 'big')
+        expected = -(-length // size) * width
+        body = _read_full(source, expected)
+        if len(body) != expected:
+            raise ValueError("Truncated frame")
+        metrics = _ACTIVE_METRICS.get()
+        if metrics is not None:
+            metrics.count('modexp', len(body) // width)
+        view = memoryview(body)
+        blocks = [_private_op(private_key, int.from_bytes(view[i:i + width], 'big')) for i in range(0, len(body), width)]
+        if blocks and max(blocks) >> (8 * size):
+            raise ValueError("Invalid block in frame (wrong key or tampered data)")
+        chunk = b''.join([m.to_bytes(size, 'big') for m in blocks])[:length]
+        if hasher is not None:
+            hasher.update(chunk)
+        yield chunk
+
+# Binary ciphertext container: a fixed header followed by count blocks of
+# width bytes each, big-endian. Header fields: magic, format version,
+# encryption mode, block width, block count, public key fingerprint.
+_CONTAINER_HEADER = struct.Struct('>4sBBHQ16s')
+_CONTAINER_MAGIC = b'RSAC'
+_CONTAINER_VERSION = 1
+_CONTAINER_MODES = ('char', 'block')
+
+def key_fingerprint(public_key):
+    """16-byte fingerprint of a public key: truncated SHA-256 of e and n."""
+    if isinstance(public_key, PublicKey):
+        return public_key.fingerprint
+    e, n = public_key
+    e_bytes = e.to_bytes((e.bit_length() + 7) // 8, 'big')
+    n_bytes = n.to_bytes((n.bit_length() + 7) // 8, 'big')
+    digest = hashlib.sha256(len(e_bytes).to_bytes(4, 'big') + e_bytes + n_bytes).digest()
+    return digest[:16]
+
+def encode_ciphertext(public_key, ciphertext, mode='char'):
+    """
+    Packs a list of ciphertext integers into the binary container:
+    a header naming the key and mode, then fixed-width blocks of n's
+    byte length. Returns bytes.
+    """
+    width = byte_length(public_key)
+    offset = _CONTAINER_HEADER.size
+    out = bytearray(offset + width * len(ciphertext))
+    _CONTAINER_HEADER.pack_into(out, 0, _CONTAINER_MAGIC, _CONTAINER_VERSION,
+                                _CONTAINER_MODES.index(mode), width, len(ciphertext),
+                                key_fingerprint(public_key))
+    for c in ciphertext:
+        out[offset:offset + width] = c.to_bytes(width, 'big')
+        offset += width
+    return bytes(out)
+
+def decode_ciphertext(buffer):
+    """
+    Opens a binary container held in bytes, a memoryview or an mmap
+    without copying its blocks. Returns a CiphertextView.
+    """
+    return CiphertextView(buffer)
+
+class CiphertextView(Sequence):
+    """
+    Read-only sequence over the blocks of a binary ciphertext container.
+    Blocks are converted to ints only when accessed, straight from the
+    underlying buffer, so the view can be passed to decrypt_message in
+    place of a list. The buffer must stay open while the view is used.
+    """
+
+    def __init__(self, buffer):
+        view = memoryview(buffer).cast('B')
+        if len(view) < _CONTAINER_HEADER.size:
+            raise ValueError("Buffer is too short for a ciphertext header")
+        magic, version, mode, width, count, fingerprint = _CONTAINER_HEADER.unpack_from(view)
+        if magic != _CONTAINER_MAGIC or version != _CONTAINER_VERSION:
+            raise ValueError("Not a ciphertext container")
+        if mode >= len(_CONTAINER_MODES) or width == 0:
+            raise ValueError("Corrupt ciphertext header")
+        end = _CONTAINER_HEADER.size + width * count
+        if len(view) < end:
+            raise ValueError("Truncated ciphertext container")
+        self.mode = _CONTAINER_MODES[mode]
+        self.width = width
+        self.fingerprint = fingerprint
+        self.blocks = view[_CONTAINER_HEADER.size:end]
+
+    def __len__(self):
+        return len(self.blocks) // self.width
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("ciphertext block index out of range")
+        start = index * self.width
+        return int.from_bytes(self.blocks[start:start + self.width], 'big')
+
+    def __iter__(self):
+        blocks, width = self.blocks, self.width
+        for start in range(0, len(blocks), width):
+            yield int.from_bytes(blocks[start:start + width], 'big')
+
+    def __repr__(self):
+        return f"CiphertextView(mode={self.mode!r}, blocks={len(self)}, width={self.width})"
+
+# Hybrid format: a header, the wrapped session secret (width bytes), then
+# frames. Header fields: magic, format version, width of n in bytes,
+# plaintext bytes per frame, public key fingerprint. Each frame is a
+# 4-byte length (top bit set on the final frame), that many bytes of
+# ciphertext, and a 32-byte BLAKE2b tag.
+_HYBRID_HEADER = struct.Struct('>4sBxHI16s')
+_HYBRID_MAGIC = b'RSAH'
+_HYBRID_VERSION = 1
+_HYBRID_FINAL = 1 << 31
+_HYBRID_TAG_SIZE = 32
+HYBRID_CHUNK_SIZE = 1 << 20
+
+class HybridHeader:
+    """
+    Parsed header of a hybrid ciphertext: mode, width, chunk_size and
+    fingerprint as for CiphertextView, plus the wrapped session secret.
+    size is the number of bytes before the first frame.
+    """
+
+    mode = 'hybrid'
+
+    def __init__(self, buffer):
+        buffer = memoryview(buffer)
+        if len(buffer) < _HYBRID_HEADER.size:
+            raise ValueError("Truncated hybrid header")
+        magic, version, width, chunk_size, fingerprint = _HYBRID_HEADER.unpack_from(buffer)
+        if magic != _HYBRID_MAGIC or version != _HYBRID_VERSION:
+            raise ValueError("Not a hybrid ciphertext")
+        self.size = _HYBRID_HEADER.size + width
+        if len(buffer) < self.size:
+            raise ValueError("Truncated hybrid header")
+        self.width = width
+        self.chunk_size = chunk_size
+        self.fingerprint = fingerprint
+        self.wrapped_key = int.from_bytes(buffer[_HYBRID_HEADER.size:self.size], 'big')
+        self.raw = bytes(buffer[:self.size])
+
+    def __repr__(self):
+        return f"HybridHeader(width={self.width}, chunk_size={self.chunk_size})"
+
+def _hybrid_keys(secret, width, header):
+    """Keystream and MAC keys from the RSA-KEM secret, bound to the whole header."""
+    material = hashlib.shake_256(b'rsa-hybrid' + secret.to_bytes(width, 'big') + header).digest(64)
+    return material[:32], material[32:]
+
+def _xor(data, keystream):
+    np = _numpy()
+    if np is not None:
+        dtype = np.uint64 if len(data) % 8 == 0 else np.uint8
+        return np.bitwise_xor(np.frombuffer(data, dtype), np.frombuffer(keystream, dtype)).tobytes()
+    return (int.from_bytes(data, 'little') ^ int.from_bytes(keystream, 'little')).to_bytes(len(data), 'little')
+
+def _hybrid_frame(enc_key, mac_key, index, chunk, final, decrypt=False):
+    """
+    Encrypts (or decrypts) one frame with a SHAKE-128 keystream and
+    returns (length field, output, tag). The tag is BLAKE2b over the
+    frame index, length field and ciphertext, so frames cannot be
+    reordered, dropped or truncated without failing verification.
+    """
+    counter = index.to_bytes(8, 'big')
+    field = (len(chunk) | (_HYBRID_FINAL if final else 0)).to_bytes(4, 'big')
+    output = _xor(chunk, hashlib.shake_128(enc_key + counter).digest(len(chunk))) if chunk else b''
+    mac = hashlib.blake2b(key=mac_key, digest_size=_HYBRID_TAG_SIZE)
+    mac.update(counter + field)
+    mac.update(chunk if decrypt else output)
+    return field, output, mac.digest()
+
+def hybrid_encrypt_stream(public_key, source, chunk_size=HYBRID_CHUNK_SIZE, rng=None):
+    """
+    Hybrid encryption of a binary file-like object: one RSA operation
+    wraps a fresh random secret (RSA-KEM), and the data is encrypted
+    with a SHAKE-128 keystream and authenticated with BLAKE2b
+    (encrypt-then-MAC) chunk by chunk. Yields the header, then one
+    frame per chunk_size bytes of plaintext.
+    rng defaults to the operating system's random source.
+    Raises ValueError unless 0 < chunk_size < 2^31.
+    """
+    if not 0 < chunk_size < _HYBRID_FINAL:
+        raise ValueError(f"chunk_size must be between 1 and {_HYBRID_FINAL - 1}")
+    e, n = public_key
+    width = byte_length(public_key)
+    secret = (rng or random.SystemRandom()).randrange(2, n - 1)
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is not None:
+        metrics.count('modexp')
+    header = _HYBRID_HEADER.pack(_HYBRID_MAGIC, _HYBRID_VERSION, width, chunk_size,
+                                 key_fingerprint(public_key)) + pow(secret, e, n).to_bytes(width, 'big')
+    enc_key, mac_key = _hybrid_keys(secret, width, header)
+    yield header
+
+    index = 0
+    chunk = _read_full(source, chunk_size)
+    while True:
+        following = _read_full(source, chunk_size) if len(chunk) == chunk_size else b''
+        field, output, tag = _hybrid_frame(enc_key, mac_key, index, chunk, not following)
+        yield field + output + tag
+        if not following:
+            break
+        chunk = following
+        index += 1
+
+def hybrid_decrypt_stream(private_key, source):
+    """
+    Decrypts hybrid_encrypt_stream output from a binary file-like
+    object with one private-key operation, yielding plaintext one
+    verified chunk at a time. Raises ValueError if any frame fails
+    its MAC or the stream is truncated or extended.
+    """
+    fixed = _read_full(source, _HYBRID_HEADER.size)
+    if len(fixed) < _HYBRID_HEADER.size:
+        raise ValueError("Truncated hybrid header")
+    header = HybridHeader(fixed + _read_full(source, _HYBRID_HEADER.unpack(fixed)[2]))
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is not None:
+        metrics.count('modexp')
+    secret = _private_op(private_key, header.wrapped_key)
+    if secret >> (8 * header.width):
+        # Only a wrong (larger) key unwraps to a secret wider than n
+        raise ValueError("Hybrid ciphertext failed authentication (wrong key or tampered data)")
+    enc_key, mac_key = _hybrid_keys(secret, header.width, header.raw)
+
+    index = 0
+    while True:
+        field = _read_full(source, 4)
+        if len(field) < 4:
+            raise ValueError("Truncated hybrid ciphertext")
+        length = int.from_bytes(field, 'big')
+        final = bool(length & _HYBRID_FINAL)
+        length &= ~_HYBRID_FINAL
+        if length > header.chunk_size or (length < header.chunk_size and not final):
+            raise ValueError("Invalid hybrid frame length")
+        body = _read_full(source, length + _HYBRID_TAG_SIZE)
+        if len(body) < length + _HYBRID_TAG_SIZE:
+            raise ValueError("Truncated hybrid ciphertext")
+        chunk, tag = body[:length], body[length:]
+        _, plaintext, expected = _hybrid_frame(enc_key, mac_key, index, chunk, final, decrypt=True)
+        if not hmac.compare_digest(tag, expected):
+            raise ValueError("Hybrid ciphertext failed authentication (wrong key or tampered data)")
+        yield plaintext
+        if final:
+            break
+        index += 1
+    if source.read(1):
+        raise ValueError("Unexpected data after the final hybrid frame")
+
+def hybrid_encrypt(public_key, message, chunk_size=HYBRID_CHUNK_SIZE):
+    """
+    Hybrid-encrypts a str (as UTF-8) or bytes-like message.
+    Returns the ciphertext as bytes; see hybrid_encrypt_stream.
+    """
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    return b''.join(hybrid_encrypt_stream(public_key, io.BytesIO(message), chunk_size))
+
+def hybrid_decrypt(private_key, ciphertext):
+    """
+    Decrypts and verifies a hybrid ciphertext. Returns the plaintext
+    bytes, or raises ValueError if it fails authentication.
+    """
+    return b''.join(hybrid_decrypt_stream(private_key, io.BytesIO(ciphertext)))
+
+def _private_op(private_key, c):
+    """
+    Compute c^d mod n, using Garner's CRT recombination when the key
+    carries its primes, folding in any further primes one at a time.
+    Plain (d, n) tuples fall back to a full pow().
+    """
+    if isinstance(private_key, PrivateKey):
+        p, q = private_key.p, private_key.q
+        m1 = pow(c, private_key.dp, p)
+        m2 = pow(c, private_key.dq, q)
+        h = (private_key.q_inv * (m1 - m2)) % p
+        m = m2 + h * q
+        if private_key.others:
+            product = p * q
+            for r, d_r, t in private_key.others:
+                h = ((pow(c, d_r, r) - m) * t) % r
+                m += h * product
+                product *= r
+        return m
     d, n = private_key
-    plain = [chr(pow(char, d, n)) for char in ciphertext]
-    return ''.join(plain)
+    return pow(c, d, n)
+
+def _update_hash(hasher, message):
+    """
+    Feeds a str, a bytes-like object or a binary file-like object into
+    hasher in chunks, so no second full-size copy is ever made.
+    """
+    if isinstance(message, str):
+        for i in range(0, len(message), STREAM_CHUNK_SIZE):
+            hasher.update(message[i:i + STREAM_CHUNK_SIZE].encode())
+    elif isinstance(message, (bytes, bytearray, memoryview)):
+        hasher.update(message)
+    else:
+        for chunk in iter(lambda: message.read(STREAM_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher
 
 def compute_hash(message):
-    """Compute SHA-256 hash of message."""
-    return hashlib.sha256(message.encode()).hexdigest()
+    """
+    Compute SHA-256 hash of message: a str, a bytes-like object, or a
+    binary file-like object, which is hashed incrementally.
+    """
+    return _update_hash(hashlib.sha256(), message).hexdigest()
+
+def _fdh_prefix(n):
+    """SHAKE-256 state keyed by n, shared by every hash under one key."""
+    return hashlib.shake_256(b'rsa-fdh' + n.to_bytes((n.bit_length() + 7) // 8, 'big'))
+
+def _fdh(prefix, digest, n):
+    """
+    Full-domain hash of a SHA-256 digest: SHAKE-256 output 16 bytes
+    longer than n, reduced mod n so the bias is negligible.
+    """
+    hasher = prefix.copy()
+    hasher.update(digest)
+    return int.from_bytes(hasher.digest((n.bit_length() + 7) // 8 + 16), 'big') % n
+
+def sign_digest(private_key, digest):
+    """
+    Signs a SHA-256 digest (bytes), e.g. from a hasher passed to
+    encrypt_stream. Uses CRT when the key carries its primes.
+    """
+    n = private_key[1]
+    return _private_op(private_key, _fdh(_fdh_prefix(n), digest, n))
+
+def sign(private_key, message):
+    """
+    Signs message (str, bytes-like or binary file-like, hashed
+    incrementally) with RSA full-domain hashing. Returns an int below n.
+    """
+    return sign_digest(private_key, _update_hash(hashlib.sha256(), message).digest())
+
+def verify_digest(public_key, digest, signature):
+    """True if signature is valid for the SHA-256 digest under public_key."""
+    e, n = public_key
+    return 0 <= signature < n and pow(signature, e, n) == _fdh(_fdh_prefix(n), digest, n)
+
+def verify(public_key, message, signature):
+    """True if signature is a valid signature of message under public_key."""
+    return verify_digest(public_key, _update_hash(hashlib.sha256(), message).digest(), signature)
+
+def verify_batch(public_key, items, workers=None):
+    """
+    Verifies many (message, signature) pairs under one public key and
+    returns a list of booleans in the same order. The SHAKE state keyed
+    by n is set up once, and the public operations go through
+    _apply_key in one call: vectorized for small n, and spread over
+    workers processes for large batches.
+
+    Each signature is checked on its own. Multiplying the batch into one
+    product check would be cheaper, but it also accepts signatures
+    swapped between records.
+    """
+    e, n = public_key
+    prefix = _fdh_prefix(n)
+    expected = []
+    signatures = []
+    for message, signature in items:
+        expected.append(_fdh(prefix, _update_hash(hashlib.sha256(), message).digest(), n))
+        signatures.append(signature)
+    in_range = [0 <= s < n for s in signatures]
+    recovered = _apply_key(public_key, [s if ok else 0 for s, ok in zip(signatures, in_range)], False, workers)
+    return [ok and r == h for ok, r, h in zip(in_range, recovered, expected)]
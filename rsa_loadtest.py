@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+
+import rsa_service
+
+def _message(length, rng):
+    return ''.join(chr(rng.randrange(32, 127)) for _ in range(length))
+
+async def _request(reader, writer, host, op, payload):
+    """Sends one keep-alive POST; returns (status, parsed JSON body)."""
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"POST /{op} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+def build_payloads(host, port, op, bits, message_size, seed=0):
+    """
+    Returns a function giving the (op, payload) for the next request.
+    encrypt and decrypt use one key fetched from the service up front;
+    "mix" cycles through every operation.
+    """
+    rng = random.Random(seed)
+    client = rsa_service.Client(f"http://{host}:{port}")
+    public_key, private_key, *_ = client.generate_keypair(bits)
+    messages = [_message(message_size, rng) for _ in range(16)]
+    ciphertexts = [client.encrypt_message(public_key, m) for m in messages]
+    private = list(private_key) + list(private_key.primes)
+
+    def payload(op):
+        i = rng.randrange(len(messages))
+        if op == "keygen":
+            return {"bits": bits}
+        if op == "encrypt":
+            return {"public_key": list(public_key), "message": messages[i]}
+        if op == "decrypt":
+            return {"private_key": private, "ciphertext": ciphertexts[i]}
+        return {"message": messages[i]}
+
+    turns = itertools.cycle([o for o in rsa_service.OPERATIONS if o != "keygen"] if op == "mix" else [op])
+
+    def next_request():
+        op = next(turns)
+        return op, payload(op)
+
+    return next_request
+
+async def _worker(host, port, next_request, deadline, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            op, payload = next_request()
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, host, op, payload)
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def run(url, op="encrypt", concurrency=16, duration=10.0, bits=512, message_size=64, seed=0):
+    """
+    Drives the service at url with concurrency keep-alive connections
+    for duration seconds. Returns throughput, latency percentiles of
+    the successful requests (seconds) and counts per HTTP status.
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or rsa_service.DEFAULT_PORT
+    next_request = await asyncio.get_running_loop().run_in_executor(
+        None, build_payloads, host, port, op, bits, message_size, seed)
+
+    latencies, statuses = [], {}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(_worker(host, port, next_request, deadline, latencies, statuses)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "op": op,
+        "concurrency": concurrency,
+        "duration": elapsed,
+        "requests": sum(statuses.values()),
+        "throughput": len(latencies) / elapsed,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100)
+        report.update(p50=cuts[49], p95=cuts[94], p99=cuts[98], max=max(latencies))
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a running rsa_service.")
+    parser.add_argument("--url", default=f"http://{rsa_service.DEFAULT_HOST}:{rsa_service.DEFAULT_PORT}")
+    parser.add_argument("--op", default="encrypt", choices=rsa_service.OPERATIONS + ("mix",),
+                        help="operation to request; mix cycles encrypt, decrypt and hash")
+    parser.add_argument("--concurrency", type=int, default=16, help="open connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--bits", type=int, default=512, help="key size")
+    parser.add_argument("--message-size", type=int, default=64, help="characters per message")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args.url, args.op, args.concurrency, args.duration,
+                             args.bits, args.message_size, args.seed))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['requests']} requests in {report['duration']:.2f} s "
+              f"({report['throughput']:.1f} ok/s), statuses {report['statuses']}")
+        if "p50" in report:
+            print(f"latency p50 {report['p50'] * 1e3:.2f} ms   p95 {report['p95'] * 1e3:.2f} ms   "
+                  f"p99 {report['p99'] * 1e3:.2f} ms   max {report['max'] * 1e3:.2f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+import rsa_lib
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8750
+
+# Requests larger than this are refused with 413
+MAX_BODY = 16 << 20
+
+# Key sizes keygen accepts; smaller ones can loop forever looking for
+# distinct primes, larger ones would hold a worker for minutes
+MIN_KEY_BITS = 8
+MAX_KEY_BITS = 4096
+
+# Operations served under POST /<name>
+OPERATIONS = ("keygen", "encrypt", "decrypt", "hash")
+
+# Key generation is not batched: one slow key would hold up the others
+# queued with it, and each key already fills a worker on its own.
+UNBATCHED = ("keygen",)
+
+_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+class Overloaded(Exception):
+    """Raised when an operation's queue is full; answered with 503."""
+
+def _init_worker():
+    # Forked workers inherit the parent's random state and would
+    # otherwise all generate the same keys
+    random.seed()
+
+def _ints(values, name, length=None):
+    """values if it is a list of ints (of the given length), else ValueError naming the field."""
+    if not isinstance(values, list) or any(type(v) is not int for v in values):
+        raise ValueError(f"{name} must be a list of integers")
+    if length is not None and len(values) != length:
+        raise ValueError(f"{name} must have {length} entries")
+    return values
+
+def _text(payload, name):
+    value = payload[name]
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string")
+    return value
+
+def _private_key(values):
+    """Private key from its JSON form: [d, n, p, q, ...] keeps CRT, [d, n] does not."""
+    values = _ints(values, "private_key")
+    if len(values) >= 4:
+        if any(r < 2 for r in values[2:]):
+            raise ValueError("private_key primes must be at least 2")
+        # PrivateKey checks that the primes multiply to n
+        return rsa_lib.PrivateKey(*values)
+    if len(values) != 2:
+        raise ValueError("private_key must be [d, n] or [d, n, p, q, ...]")
+    d, n = values
+    return (d, n)
+
+def _execute(op, payload):
+    """Runs one request in a worker process and returns its JSON result."""
+    if op == "keygen":
+        bits = int(payload.get("bits", 1024))
+        if not MIN_KEY_BITS <= bits <= MAX_KEY_BITS:
+            raise ValueError(f"bits must be between {MIN_KEY_BITS} and {MAX_KEY_BITS}")
+        # generate_keypair rejects prime counts that leave too few bits per prime
+        (e, n), private_key, *primes, phi = rsa_lib.generate_keypair(bits, primes=int(payload.get("primes", 2)))
+        return {"e": e, "n": n, "d": private_key[0], "primes": primes}
+    if op == "encrypt":
+        e, n = _ints(payload["public_key"], "public_key", 2)
+        if e < 1 or n < 2:
+            raise ValueError("public_key must have e >= 1 and n >= 2")
+        mode = payload.get("mode", "char")
+        return {"ciphertext": rsa_lib.encrypt_message((e, n), _text(payload, "message"), mode)}
+    if op == "decrypt":
+        private_key = _private_key(payload["private_key"])
+        ciphertext = _ints(payload["ciphertext"], "ciphertext")
+        return {"message": rsa_lib.decrypt_message(private_key, ciphertext, payload.get("mode", "char"))}
+    if op == "hash":
+        return {"hash": rsa_lib.compute_hash(_text(payload, "message"))}
+    raise ValueError(f"Unknown operation: {op!r}")
+
+def _run_batch(op, payloads):
+    """
+    Process pool task: runs a batch of requests for one operation.
+    Returns (ok, result_or_message) per request, so one bad request
+    does not fail the others in its batch.
+    """
+    results = []
+    for payload in payloads:
+        try:
+            results.append((True, _execute(op, payload)))
+        except Exception as exc:
+            results.append((False, f"{type(exc).__name__}: {exc}"))
+    return results
+
+class Batcher:
+    """
+    Queues requests for one operation and hands them to the process
+    pool in batches of up to batch_size, waiting at most batch_delay
+    seconds for a batch to fill. At most max_batches batches are in the
+    pool at once; beyond that requests wait in the queue, and once
+    queue_depth are waiting submit raises Overloaded.
+    """
+
+    def __init__(self, op, executor, batch_size=32, batch_delay=0.002, queue_depth=256, max_batches=2):
+        self.op = op
+        self.executor = executor
+        self.batch_size = 1 if op in UNBATCHED else batch_size
+        self.batch_delay = batch_delay
+        self.served = 0
+        self.rejected = 0
+        self.batches = 0
+        self._queue = asyncio.Queue(queue_depth)
+        self._slots = asyncio.Semaphore(max_batches)
+        self._tasks = set()
+        self._dispatcher = None
+
+    def start(self):
+        self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def submit(self, payload):
+        """Queues one request and waits for its (ok, result) pair."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((payload, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise Overloaded(f"{self.op} queue is full ({self._queue.maxsize} waiting)")
+        return await future
+
+    def depth(self):
+        """Number of requests waiting for a batch."""
+        return self._queue.qsize()
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_delay
+        while len(batch) < self.batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _dispatch(self):
+        while True:
+            # Take a pool slot first, so requests back up in the queue
+            # (where depth is bounded) rather than in the executor
+            await self._slots.acquire()
+            batch = await self._next_batch()
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        try:
+            payloads = [payload for payload, future in batch]
+            loop = asyncio.get_running_loop()
+            try:
+                results = await loop.run_in_executor(self.executor, _run_batch, self.op, payloads)
+            except Exception as exc:
+                results = [(False, f"worker failed: {exc}")] * len(batch)
+            for (payload, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self.served += len(batch)
+            self.batches += 1
+        finally:
+            self._slots.release()
+
+    async def stop(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+
+class Service:
+    """
+    Asynchronous HTTP/JSON front end for rsa_lib. The event loop only
+    parses requests and writes responses; every rsa_lib call runs in a
+    process pool of the given number of workers, batched per operation.
+
+    Endpoints:
+        POST /keygen   {"bits", "primes"}                    -> {"e", "n", "d", "primes"}
+        POST /encrypt  {"public_key": [e, n], "message", "mode"} -> {"ciphertext"}
+        POST /decrypt  {"private_key": [d, n, p, q, ...], "ciphertext", "mode"} -> {"message"}
+        POST /hash     {"message"}                           -> {"hash"}
+        GET  /stats    queue depths and counters per operation
+    """
+
+    def __init__(self, workers=None, batch_size=32, batch_delay=0.002, queue_depth=256):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.queue_depth = queue_depth
+        self.executor = None
+        self.batchers = {}
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Starts the pool and the listening socket; returns the bound port."""
+        max_batches = self.workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_batches, initializer=_init_worker)
+        for op in OPERATIONS:
+            batcher = Batcher(op, self.executor, self.batch_size, self.batch_delay, self.queue_depth, max_batches)
+            batcher.start()
+            self.batchers[op] = batcher
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return {
+            op: {
+                "queued": batcher.depth(),
+                "served": batcher.served,
+                "rejected": batcher.rejected,
+                "batches": batcher.batches,
+            }
+            for op, batcher in self.batchers.items()
+        }
+
+    async def _route(self, method, path, body):
+        """Returns (status, JSON-serializable body) for one request."""
+        path = path.split("?", 1)[0]
+        if path == "/stats":
+            return (200, self.stats()) if method == "GET" else (405, {"error": "use GET"})
+        op = path.strip("/")
+        if op not in self.batchers:
+            return 404, {"error": f"no such endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "request body is not valid JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "request body must be a JSON object"}
+        try:
+            ok, result = await self.batchers[op].submit(payload)
+        except Overloaded as exc:
+            return 503, {"error": str(exc)}
+        if not ok:
+            return 400, {"error": result}
+        return 200, result
+
+    async def _handle(self, reader, writer):
+        """Serves one connection; HTTP/1.1 keep-alive unless the client closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The body cannot be skipped without a length, so close afterwards
+                    status, result = 400, {"error": "invalid Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY:
+                    status, result = 413, {"error": f"body larger than {MAX_BODY} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, result = await self._route(method, path, body)
+
+                payload = json.dumps(result).encode()
+                head = [
+                    f"HTTP/1.1 {status} {_STATUS_TEXT[status]}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(payload)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                ]
+                if status == 503:
+                    head.append("Retry-After: 1")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+class ServiceError(Exception):
+    """An error response from the service."""
+
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+class Client:
+    """
+    Blocking client with the same calls and return values as rsa_lib,
+    so callers can use either interchangeably.
+    """
+
+    def __init__(self, url, timeout=60.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, op, payload):
+        request = urllib.request.Request(
+            f"{self.url}/{op}",
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as exc:
+            try:
+                message = json.load(exc).get("error", exc.reason)
+            except ValueError:
+                message = exc.reason
+            raise ServiceError(exc.code, message) from None
+
+    def generate_keypair(self, bits=1024, primes=2):
+        """Returns ((e, n), (d, n), p, q, phi), with the CRT parameters rebuilt locally."""
+        result = self._call("keygen", {"bits": bits, "primes": primes})
+        return rsa_lib.keypair_from_factors(result["primes"], result["e"])
+
+    def encrypt_message(self, public_key, message, mode='char'):
+        e, n = public_key
+        return self._call("encrypt", {"public_key": [e, n], "message": message, "mode": mode})["ciphertext"]
+
+    def decrypt_message(self, private_key, ciphertext, mode='char'):
+        values = list(private_key)
+        if isinstance(private_key, rsa_lib.PrivateKey):
+            values += private_key.primes
+        try:
+            return self._call("decrypt", {"private_key": values, "ciphertext": list(ciphertext), "mode": mode})["message"]
+        except ServiceError as exc:
+            # Same exception rsa_lib raises for a ciphertext that does not decode
+            if exc.status == 400:
+                raise ValueError(str(exc)) from None
+            raise
+
+    def compute_hash(self, message):
+        return self._call("hash", {"message": message})["hash"]
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    service = Service(**options)
+    port = await service.start(host, port)
+    print(f"rsa_service listening on http://{host}:{port}", file=sys.stderr)
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve rsa_lib over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=32, help="most requests per pool task")
+    parser.add_argument("--batch-delay", type=float, default=0.002,
+                        help="seconds to wait for a batch to fill (default 0.002)")
+    parser.add_argument("--queue-depth", type=int, default=256,
+                        help="waiting requests per operation before answering 503")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, batch_size=args.batch_size,
+                          batch_delay=args.batch_delay, queue_depth=args.queue_depth))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
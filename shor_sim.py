@@ -0,0 +1,213 @@
+import math
+import random
+import time
+
+import rsa_lib
+
+# Exponents per block in the vectorized scan, and how far it scans
+# before handing over to baby-step giant-step
+SCAN_BLOCK = 1 << 16
+SCAN_LIMIT = 1 << 20
+
+# Baby-step table size the first BSGS round starts from
+BSGS_START = 1 << 10
+
+# Steps between deadline checks in the pure-Python loops
+CHECK_EVERY = 4096
+
+class OrderTimeout(Exception):
+    """Raised when order finding runs past its deadline."""
+
+def _check(deadline):
+    if deadline is not None and time.perf_counter() >= deadline:
+        raise OrderTimeout("order finding ran out of time")
+
+def scan_order(a, N, limit=SCAN_LIMIT, deadline=None):
+    """
+    Smallest r in 1..limit with a^r = 1 (mod N), found by computing
+    a^x mod N for a whole block of consecutive x at a time with NumPy.
+    Needs NumPy and N < 2^32. Returns None if r > limit.
+    """
+    np = rsa_lib._numpy()
+    if np is None or N >= rsa_lib.VECTOR_MODULUS_LIMIT:
+        raise ValueError("scan_order needs NumPy and N < 2^32")
+    modulus = np.uint64(N)
+    # a^0 .. a^(SCAN_BLOCK - 1), built by doubling the filled prefix
+    block = np.ones(SCAN_BLOCK, dtype=np.uint64)
+    filled, step = 1, a % N
+    while filled < SCAN_BLOCK:
+        np.remainder(block[:filled] * np.uint64(step), modulus, out=block[filled:2 * filled])
+        filled *= 2
+        step = step * step % N
+    stride = np.uint64(pow(a, SCAN_BLOCK, N))
+
+    for start in range(0, limit, SCAN_BLOCK):
+        hits = np.flatnonzero(block == 1)
+        if start == 0:
+            hits = hits[1:]  # a^0 = 1 is not a period
+        if len(hits):
+            r = start + int(hits[0])
+            return r if r <= limit else None
+        _check(deadline)
+        np.remainder(block * stride, modulus, out=block)
+    return None
+
+def bsgs_order(a, N, deadline=None):
+    """
+    Smallest r > 0 with a^r = 1 (mod N), by baby-step giant-step with a
+    hash table of baby steps a^j. The table starts small and doubles, so
+    short orders are found quickly and memory grows with sqrt(r), not
+    sqrt(N).
+    """
+    baby = {}
+    value = 1
+    m = BSGS_START
+    while True:
+        # Baby steps: a^j for j below m; a repeat of 1 is the order itself
+        for j in range(len(baby), m):
+            if j and value == 1:
+                return j
+            baby.setdefault(value, j)
+            value = value * a % N
+            if j % CHECK_EVERY == 0:
+                _check(deadline)
+        # Giant steps: a^(i m) = a^j means r divides i m - j. Any hit is
+        # a multiple of r no larger than m^2, so the first hit is r itself
+        # once r > m and r <= m^2.
+        giant = pow(a, m, N)
+        y = giant
+        for i in range(1, m + 1):
+            j = baby.get(y)
+            if j is not None:
+                return i * m - j
+            y = y * giant % N
+            if i % CHECK_EVERY == 0:
+                _check(deadline)
+        m *= 2
+
+def find_order(a, N, budget=5.0):
+    """
+    The multiplicative order r of a modulo N: the period of
+    f(x) = a^x mod N that the quantum part of Shor's algorithm finds.
+    Uses the vectorized scan first when N < 2^32 and NumPy is available,
+    then baby-step giant-step. Returns (r, method), or (None, method)
+    if the time budget (seconds) ran out.
+    """
+    a %= N
+    if math.gcd(a, N) != 1:
+        raise ValueError(f"a = {a} shares a factor with N, so it has no order")
+    if a == 1:
+        return 1, "trivial"
+    deadline = time.perf_counter() + budget
+    method = "bsgs"
+    try:
+        if N < rsa_lib.VECTOR_MODULUS_LIMIT and rsa_lib._numpy():
+            method = "scan"
+            r = scan_order(a, N, deadline=deadline)
+            if r is not None:
+                return r, method
+            method = "scan+bsgs"
+        return bsgs_order(a, N, deadline), method
+    except OrderTimeout:
+        return None, method
+
+def sample_period(a, N, r, periods=3, per_period=80):
+    """
+    Points (xs, ys) of f(x) = a^x mod N over the given number of
+    periods, with at most per_period samples in each. The samples are
+    x = floor(k r / per_period), so every period is sampled at the same
+    offsets and the plot repeats exactly however large r is.
+    """
+    per = min(per_period, r)
+    xs = [k * r // per for k in range(periods * per + 1)]
+    return xs, [pow(a, x, N) for x in xs]
+
+def _integer_root(n, k):
+    """Largest x with x^k <= n."""
+    x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+def _perfect_power(n):
+    """A nontrivial root x of n = x^k, or None."""
+    for k in range(2, n.bit_length() + 1):
+        x = _integer_root(n, k)
+        if x < 2:
+            break
+        if x ** k == n:
+            return x
+    return None
+
+class Attempt:
+    """
+    One round of Shor's algorithm with base a (None when N was handled
+    before choosing one): the order r found (None if there was none or
+    time ran out), a^(r/2) mod N, the factors it
+    gave and a note on the outcome.
+    """
+
+    def __init__(self, a, r=None, method=None, half_power=None, factors=None, note=""):
+        self.a = a
+        self.r = r
+        self.method = method
+        self.half_power = half_power
+        self.factors = factors
+        self.note = note
+
+def shor(N, a=None, budget=5.0, attempts=10, rng=random):
+    """
+    Shor's algorithm with the quantum period finding replaced by
+    find_order. Tries bases until gcd(a^(r/2) +- 1, N) splits N, giving
+    up after attempts bases or budget seconds. With a given, only that
+    base is tried. Returns (factors, attempts) where factors is (p, N // p)
+    or None.
+    """
+    deadline = time.perf_counter() + budget
+    if N % 2 == 0:
+        return (2, N // 2), [Attempt(None, note="N is even: no period finding needed.")]
+    if rsa_lib.is_prime(N):
+        return None, [Attempt(None, note="N is prime: there is nothing to factor.")]
+    root = _perfect_power(N)
+    if root is not None:
+        return (root, N // root), [Attempt(None, note=f"N is a power of {root}: Shor's algorithm needs a non-prime-power N.")]
+
+    tried = []
+    bases = [a % N] if a else (rng.randrange(2, N - 1) for _ in range(attempts))
+    for base in bases:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        g = math.gcd(base, N)
+        if g == N:
+            tried.append(Attempt(base, note="a is a multiple of N: pick another a."))
+            continue
+        if g != 1:
+            tried.append(Attempt(base, factors=(g, N // g),
+                                 note="a shares a factor with N: found by gcd, no period needed."))
+            return (g, N // g), tried
+        if base in (1, N - 1):
+            tried.append(Attempt(base, r=1 if base == 1 else 2, note="Trivial base: its order is at most 2."))
+            continue
+        r, method = find_order(base, N, remaining)
+        attempt = Attempt(base, r, method)
+        tried.append(attempt)
+        if r is None:
+            attempt.note = "Ran out of time while finding the period."
+            break
+        if r % 2:
+            attempt.note = "r is odd: pick another a."
+            continue
+        attempt.half_power = pow(base, r // 2, N)
+        if attempt.half_power == N - 1:
+            attempt.note = "a^(r/2) = -1 (mod N): pick another a."
+            continue
+        p = math.gcd(attempt.half_power - 1, N)
+        if p in (1, N):
+            p = math.gcd(attempt.half_power + 1, N)
+        attempt.factors = (p, N // p)
+        attempt.note = "gcd(a^(r/2) ± 1, N) split N."
+        return attempt.factors, tried
+    return None, tried
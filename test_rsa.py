@@ -1,5 +1,24 @@
 import rsa_lib
+import key_pool
+import factoring
+import batch_gcd
+import bench_rsa
+import keystore
+import shor_sim
+import rsa_service
+import rsa_loadtest
+import asyncio
+import hashlib
+import io
+import math
+import mmap
+import os
+import pickle
 import random
+import socket
+import tempfile
+import threading
+import time
 
 def test_rsa():
     print("Testing RSA Library...")
@@ -44,5 +63,569 @@ def test_rsa():
     
     print("\nAll Tests Passed Successfully!")
 
+def test_crt_decryption():
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=256)
+    d, n = private_key
+    assert private_key == (d, n)
+    assert private_key.q_inv * q % p == 1
+
+    message = "CRT décryption ✓"
+    cipher = rsa_lib.encrypt_message(public_key, message)
+    assert rsa_lib.decrypt_message(private_key, cipher) == message
+    # Plain tuples still take the full-exponent path
+    assert rsa_lib.decrypt_message((d, n), cipher) == message
+
+def test_block_mode():
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=256)
+    message = "Block mode packs UTF-8 bytes — ünïcödé included. " * 4
+
+    cipher = rsa_lib.encrypt_message(public_key, message, mode='block')
+    assert len(cipher) == -(-(len(message.encode('utf-8')) + 1) // rsa_lib.block_size(public_key[1]))
+    assert rsa_lib.decrypt_message(private_key, cipher, mode='block') == message
+    assert rsa_lib.decrypt_message(private_key, rsa_lib.encrypt_message(public_key, "", mode='block'), mode='block') == ""
+
+    # A wrong key, the wrong mode or a tampered block is a ValueError, never an OverflowError
+    larger = rsa_lib.generate_keypair(bits=512)[1]
+    attempts = [
+        lambda: rsa_lib.decrypt_message(larger, cipher, mode='block'),
+        lambda: rsa_lib.decrypt_message(private_key, cipher[:-1] + [cipher[-1] ^ 1], mode='block'),
+        lambda: rsa_lib.decrypt_message(larger, cipher, mode='char'),
+        lambda: b"".join(rsa_lib.decrypt_stream(
+            larger, io.BytesIO(b"".join(rsa_lib.encrypt_stream(public_key, io.BytesIO(b"data")))))),
+    ]
+    for attempt in attempts:
+        try:
+            attempt()
+            assert False, "corrupt ciphertext was accepted"
+        except ValueError:
+            pass
+
+def test_codebook():
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=64)
+    codebook = rsa_lib.Codebook(max_keys=1)
+    message = "abracadabra"
+
+    cipher = codebook.encrypt(public_key, message)
+    assert cipher == [pow(ord(c), public_key[0], public_key[1]) for c in message]
+    assert (codebook.hits, codebook.misses) == (len(message) - 5, 5)
+
+    # Every value is known from encryption, so decryption is all lookups
+    assert codebook.decrypt(private_key, cipher) == message
+    assert codebook.misses == 5
+
+    # A new key evicts the old one's table
+    other_public, other_private, *_ = rsa_lib.generate_keypair(bits=64)
+    codebook.encrypt(other_public, "a")
+    assert codebook.decrypt(private_key, cipher) == message
+    assert codebook.misses == 11
+
+    # A warm table never decrypts for the wrong exponent
+    rsa_lib.CODEBOOK.clear()
+    cipher = rsa_lib.encrypt_message(public_key, "secret")
+    for wrong_key in ((1, public_key[1]), rsa_lib.PrivateKey(private_key.d + 2, public_key[1], p, q)):
+        for _ in range(2):
+            try:
+                assert rsa_lib.decrypt_message(wrong_key, cipher) != "secret"
+            except ValueError:
+                pass
+    assert rsa_lib.decrypt_message(tuple(private_key), cipher) == "secret"
+    # Forged primes cannot pass the e * d check, as the key is refused outright
+    try:
+        rsa_lib.PrivateKey(1, public_key[1], 3, 5)
+        assert False, "forged private key accepted"
+    except ValueError:
+        pass
+    hits = rsa_lib.CODEBOOK.hits
+    assert rsa_lib.decrypt_message(private_key, cipher) == "secret"
+    assert rsa_lib.CODEBOOK.hits == hits + len("secret")
+
+def test_candidate_sieve():
+    start = 10**30 + 1
+    survivors = rsa_lib.CandidateSieve(start, window=512).survivors()
+    expected = [c for c in range(start, start + 1024, 2)
+                if all(c % s for s in rsa_lib.SMALL_PRIMES)]
+    assert survivors == expected
+
+    for bits in (2, 8, 17, 64, 256):
+        p = rsa_lib.generate_prime(bits)
+        assert p.bit_length() == bits and rsa_lib.is_prime(p)
+
+def test_generate_keypairs():
+    keys = list(rsa_lib.generate_keypairs(3, bits=64, workers=2, seed=7))
+    assert len(keys) == 3
+    for (e, n), private_key, p, q, phi in keys:
+        assert p * q == n and (e * private_key[0]) % phi == 1
+
+    again = list(rsa_lib.generate_keypairs(3, bits=64, workers=2, seed=7))
+    assert sorted(k[0] for k in again) == sorted(k[0] for k in keys)
+
+def test_key_pool():
+    path = os.path.join(tempfile.mkdtemp(), "pool.json")
+    pool = key_pool.KeyPool(sizes=(32,), target=2, path=path)
+    deadline = time.time() + 10
+    while pool.available(32) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    pool.stop()
+    assert pool.available(32) == 2
+
+    (e, n), private_key, p, q, phi = pool.get(32)
+    assert p * q == n and (e * private_key[0]) % phi == 1
+
+    # Stored private keys are readable by their owner only
+    if os.name == "posix":
+        assert os.stat(path).st_mode & 0o077 == 0
+
+    # The remaining key is reloaded from disk
+    warm = key_pool.KeyPool(sizes=(32,), target=0, path=path)
+    warm.stop()
+    assert warm.available(32) == 1
+
+def test_primality_fast_paths():
+    flags = [rsa_lib.miller_rabin(n, 20) for n in range(100000)]
+    assert [rsa_lib.is_prime(n) for n in range(100000)] == flags
+    assert [rsa_lib.baillie_psw(n) for n in range(100000)] == flags
+
+    # Strong pseudoprimes to the first witness sets, and Mersenne primes
+    for n in (3215031751, 3825123056546413051, 3317044064679887385961981):
+        assert not rsa_lib.is_prime(n) and not rsa_lib.baillie_psw(n)
+    for exponent in (61, 127, 521):
+        assert rsa_lib.is_prime(2**exponent - 1)
+        assert rsa_lib.is_prime(2**exponent - 1, method='miller-rabin')
+    assert not rsa_lib.is_prime((2**61 - 1) * (2**89 - 1))
+
+class Trickle(io.RawIOBase):
+    """Raw stream that returns at most 300 bytes per read."""
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self.data.read(min(len(buffer), 300))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+def test_stream_encryption():
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=128)
+    data = bytes(random.getrandbits(8) for _ in range(5000))
+    path = os.path.join(tempfile.mkdtemp(), "plain.bin")
+    with open(path, "wb") as f:
+        f.write(data)
+
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+        frames = list(rsa_lib.encrypt_stream(public_key, source, chunk_size=1000, hasher=hasher))
+    assert len(frames) > 1
+    assert hasher.hexdigest() == rsa_lib.compute_hash(data)
+
+    hasher = hashlib.sha256()
+    ciphertext = io.BytesIO(b"".join(frames))
+    plain = b"".join(rsa_lib.decrypt_stream(private_key, ciphertext, hasher=hasher))
+    assert plain == data
+    assert hasher.hexdigest() == rsa_lib.compute_hash(io.BytesIO(data))
+
+    # Short reads from a raw stream are not mistaken for truncation
+    assert b"".join(rsa_lib.decrypt_stream(private_key, Trickle(b"".join(frames)))) == data
+
+def test_ciphertext_container():
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=128)
+    message = "Container ✓ " * 10
+    cipher = rsa_lib.encrypt_message(public_key, message, mode='block')
+
+    blob = rsa_lib.encode_ciphertext(public_key, cipher, mode='block')
+    view = rsa_lib.decode_ciphertext(memoryview(blob))
+    assert view.mode == 'block' and view.width == 16
+    assert view.fingerprint == rsa_lib.key_fingerprint(public_key)
+    assert list(view) == cipher and view[-1] == cipher[-1] and view[1:3] == cipher[1:3]
+    assert rsa_lib.decrypt_message(private_key, view, mode=view.mode) == message
+
+    try:
+        rsa_lib.decode_ciphertext(blob[:-1])
+    except ValueError:
+        pass
+    else:
+        assert False, "truncated container was accepted"
+
+def test_parallel_encryption():
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=64)
+    message = "".join(chr(random.randrange(32, 127)) for _ in range(rsa_lib.PARALLEL_THRESHOLD * 8))
+
+    cipher = rsa_lib.encrypt_message(public_key, message, mode='block', workers=2)
+    assert cipher == rsa_lib.encrypt_message(public_key, message, mode='block')
+    assert rsa_lib.decrypt_message(private_key, cipher, mode='block', workers=2) == message
+
+def test_factoring():
+    (e, n), private_key, p, q, phi = rsa_lib.generate_keypair(bits=64)
+    found_p, found_q, d = factoring.recover_private_key((e, n), budget=30)
+    assert found_p * found_q == n and d == private_key[0]
+    assert factoring.factor(rsa_lib.generate_prime(64)) is None
+    assert factoring.factor(3 * 1000003) == 3
+
+    # p - 1 is 1000-smooth, so stage one finds it immediately
+    smooth = 2**7 * 3**5 * 5**3 * 7**2 * 11 * 13 * 17 * 19 * 23 * 29 * 31 * 37 * 41 * 43 * 47 * 53
+    k = 1
+    while not rsa_lib.is_prime(k * smooth + 1):
+        k += 1
+    n = (k * smooth + 1) * rsa_lib.generate_prime(96)
+    clock = factoring._Clock(10.0, None, None)
+    assert factoring.pollard_p_minus_1(n, clock, bound=1000) == k * smooth + 1
+
+    cancel = threading.Event()
+    cancel.set()
+    assert factoring.factor(rsa_lib.generate_prime(80) * rsa_lib.generate_prime(80), cancel=cancel) is None
+
+def test_vector_engine():
+    if rsa_lib._numpy() is None:
+        return
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=32)
+    (e, n), (d, _) = public_key, private_key
+    values = list(range(1000))
+    assert rsa_lib.vector_pow(values, e, n) == [pow(m, e, n) for m in values]
+
+    message = "".join(chr(c) for c in range(0x100, 0x100 + 500)) * 3
+    cipher = rsa_lib.encrypt_message(public_key, message)
+    assert cipher == [pow(ord(c), e, n) for c in message]
+    rsa_lib.CODEBOOK.clear()
+    assert rsa_lib.decrypt_message(private_key, cipher) == message
+
+def test_batch_gcd():
+    primes = [rsa_lib.generate_prime(64) for _ in range(24)]
+    moduli = [primes[i] * primes[i + 12] for i in range(12)]
+    # Keys 3 and 7 share a prime; key 10 appears twice
+    moduli[7] = primes[3] * rsa_lib.generate_prime(64)
+    moduli.append(moduli[10])
+
+    for spill_dir in (None, tempfile.mkdtemp()):
+        found = batch_gcd.find_shared_primes(moduli, spill_dir)
+        assert sorted(i for i, n, p, q in found) == [3, 7, 10, 12]
+        for i, n, p, q in found:
+            assert n == moduli[i]
+            if i in (3, 7):
+                assert p == primes[3] and p * q == n
+            else:
+                assert p is None
+
+    # The divide-and-conquer division agrees with %, however % is implemented
+    rng = random.Random(13)
+    fast, batch_gcd._FAST_DIVISION = batch_gcd._FAST_DIVISION, False
+    try:
+        for bits in (100, 5000, 40000):
+            m = rng.getrandbits(bits) | 1
+            x = rng.getrandbits(2 * bits + 7)
+            assert batch_gcd._mod(x, m) == x % m
+    finally:
+        batch_gcd._FAST_DIVISION = fast
+
+def test_benchmark_compare():
+    case = bench_rsa.Case("is_prime/test", rsa_lib.is_prime, lambda: (2**127 - 1,), repeat=5)
+    report = bench_rsa.run([case], warmup=1)
+    result = report["results"]["is_prime/test"]
+    assert result["runs"] == 5 and result["min"] <= result["median"] <= result["p95"]
+
+    baseline = {"results": {"is_prime/test": dict(result, median=result["median"] / 2)}}
+    assert [r[0] for r in bench_rsa.compare(baseline, report, threshold=0.5)] == ["is_prime/test"]
+    assert bench_rsa.compare(report, report) == []
+
+def test_metrics():
+    exported = []
+    rsa_lib.add_metrics_hook(exported.append)
+    try:
+        with rsa_lib.collect_metrics() as metrics:
+            public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=512)
+            rsa_lib.encrypt_message(public_key, "metrics", mode='block')
+    finally:
+        rsa_lib.remove_metrics_hook(exported.append)
+
+    assert exported == [metrics]
+    assert metrics.counters['candidates'] >= 2 and metrics.counters['mr_rounds'] >= 2
+    assert metrics.counters['modexp'] == 1
+    assert {'prime_p', 'prime_q', 'choose_e', 'mod_inverse'} <= set(metrics.timings)
+    assert 'rsa_lib_candidates_total' in metrics.to_prometheus()
+
+    # Nothing is recorded outside a collect_metrics() block
+    rsa_lib.generate_keypair(bits=64)
+    assert metrics.counters['modexp'] == 1
+
+def test_signatures():
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=512)
+    signature = rsa_lib.sign(private_key, "Pay Bob 10")
+    assert rsa_lib.verify(public_key, "Pay Bob 10", signature)
+    assert not rsa_lib.verify(public_key, "Pay Bob 1000", signature)
+    assert not rsa_lib.verify(public_key, "Pay Bob 10", signature + public_key[1])
+    # CRT signing gives the same signature as a plain (d, n) key
+    assert rsa_lib.sign(tuple(private_key), "Pay Bob 10") == signature
+
+    # Strings, bytes and streams of the same data hash and sign alike
+    text = "record ✓ " * 20000
+    data = text.encode()
+    assert rsa_lib.compute_hash(text) == hashlib.sha256(data).hexdigest()
+    assert rsa_lib.sign(private_key, io.BytesIO(data)) == rsa_lib.sign(private_key, text)
+    hasher = hashlib.sha256()
+    b"".join(rsa_lib.encrypt_stream(public_key, io.BytesIO(data), hasher=hasher))
+    assert rsa_lib.verify_digest(public_key, hasher.digest(), rsa_lib.sign(private_key, data))
+
+    items = [(f"record {i}", rsa_lib.sign(private_key, f"record {i}")) for i in range(10)]
+    items[3] = (items[3][0], items[4][1])
+    items[7] = (items[7][0], -1)
+    assert rsa_lib.verify_batch(public_key, items) == [i not in (3, 7) for i in range(10)]
+
+    # Small keys take the vectorized path
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=24)
+    items = [(str(i), rsa_lib.sign(private_key, str(i))) for i in range(100)]
+    items[50] = ("tampered", items[50][1])
+    assert rsa_lib.verify_batch(public_key, items) == [i != 50 for i in range(100)]
+
+def test_key_objects():
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=256)
+    e, n = public_key
+    d, _ = private_key
+    assert public_key == (e, n) and private_key == (d, n) and hash(public_key) == hash((e, n))
+    assert public_key.byte_length == private_key.byte_length == rsa_lib.byte_length((e, n)) == 32
+    assert public_key.fingerprint == rsa_lib.key_fingerprint((e, n))
+    assert pickle.loads(pickle.dumps(private_key)).q_inv == private_key.q_inv
+    assert not hasattr(public_key, '__dict__') and not hasattr(private_key, '__dict__')
+
+    # Plain tuples still work everywhere, and interoperate with key objects
+    for mode in ('char', 'block'):
+        cipher = rsa_lib.encrypt_message((e, n), "tuples ✓", mode)
+        assert cipher == rsa_lib.encrypt_message(public_key, "tuples ✓", mode)
+        assert rsa_lib.decrypt_message((d, n), cipher, mode) == "tuples ✓"
+        assert rsa_lib.decrypt_message(private_key, cipher, mode) == "tuples ✓"
+
+def test_keystore():
+    keys = [rsa_lib.generate_keypair(bits=128) for _ in range(50)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "keys.bin")
+        with keystore.Keystore(path, width=16) as store:
+            assert store.add(keys[:30]) == 30
+            assert store.add(keys[20:]) == 20
+            assert len(store) == 50
+            try:
+                store.add([rsa_lib.generate_keypair(bits=256)])
+                assert False, "oversized key accepted"
+            except ValueError:
+                pass
+
+        # Reopened from disk, and again with the index rebuilt from the records
+        for rebuild in (False, True):
+            if rebuild:
+                os.remove(path + ".idx")
+            with keystore.Keystore(path) as store:
+                assert len(store) == 50
+                for public_key, private_key, p, q, phi in keys:
+                    found = store.get(public_key)
+                    assert found == (public_key, private_key, p, q, phi)
+                    assert found[1].q_inv == private_key.q_inv
+                assert store.get(keys[7][0].fingerprint)[0] == keys[7][0]
+                assert store.get((3, 15)) is None and (3, 15) not in store
+
+def test_multi_prime_keys():
+    for primes in (3, 4):
+        with rsa_lib.collect_metrics() as metrics:
+            public_key, private_key, *factors, phi = rsa_lib.generate_keypair(bits=512, primes=primes)
+        e, n = public_key
+        assert len(factors) == len(set(factors)) == primes
+        assert all(f.bit_length() == 512 // primes and rsa_lib.is_prime(f) for f in factors)
+        product = 1
+        for f in factors:
+            product *= f
+        assert product == n and private_key.primes == tuple(factors)
+        assert {'prime_p', 'prime_q', 'prime_r3'} <= set(metrics.timings)
+
+        # k-way CRT agrees with a plain pow() under (d, n)
+        for mode in ('char', 'block'):
+            cipher = rsa_lib.encrypt_message(public_key, "multi-prime ✓", mode)
+            assert rsa_lib.decrypt_message(private_key, cipher, mode) == "multi-prime ✓"
+            assert rsa_lib.decrypt_message(tuple(private_key), cipher, mode) == "multi-prime ✓"
+        assert rsa_lib.verify(public_key, "signed", rsa_lib.sign(private_key, "signed"))
+        assert pickle.loads(pickle.dumps(private_key)).others == private_key.others
+
+    # Eve has to split n all the way down to recover a multi-prime key
+    public_key, private_key, *factors, phi = rsa_lib.generate_keypair(bits=48, primes=3)
+    *found, d = factoring.recover_private_key(public_key, budget=30)
+    assert found == sorted(factors) and d == private_key[0]
+
+    keys = list(rsa_lib.generate_keypairs(2, bits=96, workers=2, seed=7, primes=3))
+    assert all(len(key) == 6 for key in keys)
+    with tempfile.TemporaryDirectory() as tmp:
+        with keystore.Keystore(os.path.join(tmp, "keys.bin"), width=16, primes=3) as store:
+            store.add(keys + [rsa_lib.generate_keypair(bits=96)])
+            assert store.get(keys[0][0]) == keys[0]
+            assert store.get(keys[0][0])[1].others == keys[0][1].others
+    try:
+        rsa_lib.generate_keypair(bits=16, primes=3)
+        assert False, "16-bit three-prime key accepted"
+    except ValueError:
+        pass
+
+def test_order_finding():
+    def brute_order(a, N):
+        r, value = 1, a % N
+        while value != 1:
+            value = value * a % N
+            r += 1
+        return r
+
+    rng = random.Random(22)
+    for N in (15, 21, 91, 1001, 15015, 196611, 1009 * 1013):
+        for _ in range(5):
+            a = rng.randrange(2, N - 1)
+            if math.gcd(a, N) != 1:
+                continue
+            r = brute_order(a, N)
+            assert shor_sim.bsgs_order(a, N) == r
+            assert shor_sim.find_order(a, N)[0] == r
+            if rsa_lib._numpy():
+                assert shor_sim.scan_order(a, N) == (r if r <= shor_sim.SCAN_LIMIT else None)
+
+    factors, attempts = shor_sim.shor(15, a=7)
+    assert sorted(factors) == [3, 5] and attempts[-1].r == 4 and attempts[-1].half_power == 4
+    N = rsa_lib.generate_prime(20) * rsa_lib.generate_prime(20)
+    factors, attempts = shor_sim.shor(N, budget=30, rng=rng)
+    assert factors[0] * factors[1] == N and 1 < factors[0] < N
+    assert shor_sim.shor(49)[0] == (7, 7) and shor_sim.shor(101)[0] is None
+
+    # The budget bounds the search; the plot repeats every r samples
+    start = time.perf_counter()
+    assert shor_sim.find_order(2, rsa_lib.generate_prime(48) * rsa_lib.generate_prime(48), budget=0.2)[0] is None
+    assert time.perf_counter() - start < 2
+    xs, ys = shor_sim.sample_period(7, 15, 4)
+    assert xs == list(range(13)) and ys[:4] == ys[4:8] == [1, 7, 4, 13]
+    xs, ys = shor_sim.sample_period(2, 1000003, 1000002)
+    assert len(xs) == 241 and ys[:80] == ys[80:160]
+
+def test_hybrid_encryption():
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=512)
+    for message in ("Hello, Bob! ✓", b"", bytes(range(256)) * 40):
+        blob = rsa_lib.hybrid_encrypt(public_key, message, chunk_size=1000)
+        expected = message.encode() if isinstance(message, str) else message
+        assert rsa_lib.hybrid_decrypt(private_key, blob) == expected
+        # A plain (d, n) key unwraps the same secret
+        assert rsa_lib.hybrid_decrypt(tuple(private_key), blob) == expected
+
+    data = bytes(range(256)) * 40
+    header = rsa_lib.HybridHeader(rsa_lib.hybrid_encrypt(public_key, data, chunk_size=1000))
+    assert header.mode == 'hybrid' and header.chunk_size == 1000 and header.width == 64
+    assert header.fingerprint == rsa_lib.key_fingerprint(public_key)
+    assert 0 < header.wrapped_key < public_key[1]
+    chunks = list(rsa_lib.hybrid_decrypt_stream(
+        private_key, io.BytesIO(b"".join(rsa_lib.hybrid_encrypt_stream(public_key, io.BytesIO(data), 1000)))))
+    assert [len(c) for c in chunks] == [1000] * 10 + [240]
+
+    blob = b"".join(rsa_lib.hybrid_encrypt_stream(public_key, Trickle(data), 1000))
+    assert b"".join(rsa_lib.hybrid_decrypt_stream(private_key, Trickle(blob))) == data
+
+    for chunk_size in (0, -1, 1 << 31):
+        try:
+            rsa_lib.hybrid_encrypt(public_key, b"important data", chunk_size=chunk_size)
+            assert False, f"chunk_size={chunk_size} accepted"
+        except ValueError:
+            pass
+
+    # Tampering, truncation, extension and the wrong key are all detected
+    blob = rsa_lib.hybrid_encrypt(public_key, data, chunk_size=1000)
+    flipped = bytearray(blob)
+    flipped[header.size + 10] ^= 1
+    other = rsa_lib.generate_keypair(bits=512)[1]
+    larger = rsa_lib.generate_keypair(bits=1024)[1]
+    for bad, key in ((bytes(flipped), private_key), (blob[:-1], private_key), (blob[:header.size + 1036], private_key),
+                     (blob + b"\0", private_key), (blob, other), (blob, larger), (b"RSAC", private_key)):
+        try:
+            rsa_lib.hybrid_decrypt(key, bad)
+        except ValueError:
+            pass
+        else:
+            assert False, "corrupt hybrid ciphertext was accepted"
+
+def test_service():
+    service = rsa_service.Service(workers=2)
+    loop = asyncio.new_event_loop()
+    port = loop.run_until_complete(service.start(port=0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{port}"
+        client = rsa_service.Client(url)
+        public_key, private_key, p, q, phi = client.generate_keypair(256)
+        assert p * q == public_key[1]
+        for mode in ('char', 'block'):
+            cipher = client.encrypt_message(public_key, "Service ✓", mode)
+            assert cipher == rsa_lib.encrypt_message(public_key, "Service ✓", mode)
+            assert client.decrypt_message(private_key, cipher, mode) == "Service ✓"
+        assert client.compute_hash("abc") == rsa_lib.compute_hash("abc")
+        try:
+            client.encrypt_message(public_key, "x", mode='nope')
+            assert False, "unknown mode accepted"
+        except rsa_service.ServiceError as exc:
+            assert exc.status == 400
+        # Key sizes that could never finish are refused up front
+        for bits, primes in ((2, 2), (4, 2), (8192, 2), (256, 1), (256, 64)):
+            try:
+                client.generate_keypair(bits, primes)
+                assert False, f"keygen accepted bits={bits} primes={primes}"
+            except rsa_service.ServiceError as exc:
+                assert exc.status == 400
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"POST /hash HTTP/1.1\r\nContent-Length: lots\r\n\r\n")
+            assert sock.recv(1024).startswith(b"HTTP/1.1 400 ")
+
+        report = asyncio.run(rsa_loadtest.run(url, op="mix", concurrency=4, duration=0.3, bits=128))
+        assert report["statuses"] == {"200": report["requests"]} and report["p50"] <= report["p99"]
+    finally:
+        asyncio.run_coroutine_threadsafe(service.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    # One bad request fails alone, not the batch it shares
+    public_key, private_key, p, q, phi = rsa_lib.generate_keypair(bits=64)
+    cipher = rsa_lib.encrypt_message(public_key, "ok")
+    good = {"private_key": list(private_key) + [p, q], "ciphertext": cipher}
+    bad = [{"private_key": [5, 35, 6, 4], "ciphertext": [1]}, {"private_key": [5, 35, 1, 7], "ciphertext": [1]},
+           {"private_key": [5, 36, 6, 6], "ciphertext": [1]}, {"private_key": [1, public_key[1], 3, 5], "ciphertext": cipher},
+           {"private_key": "key", "ciphertext": cipher}, {"private_key": list(private_key), "ciphertext": None}]
+    results = rsa_service._run_batch("decrypt", [good] + bad + [good])
+    assert [ok for ok, _ in results] == [True] + [False] * len(bad) + [True]
+    assert results[0][1] == results[-1][1] == {"message": "ok"}
+    results = rsa_service._run_batch("hash", [{"message": "a"}, {"message": 5}, {"message": None}, {"message": "b"}])
+    assert [ok for ok, _ in results] == [True, False, False, True]
+
+    # A full queue is refused straight away instead of waiting
+    async def overload():
+        batcher = rsa_service.Batcher("hash", executor=None, queue_depth=1)
+        waiting = asyncio.ensure_future(batcher.submit({"message": "a"}))
+        await asyncio.sleep(0)
+        try:
+            await batcher.submit({"message": "b"})
+            assert False, "queue depth not enforced"
+        except rsa_service.Overloaded:
+            pass
+        waiting.cancel()
+        return batcher.rejected
+    assert asyncio.run(overload()) == 1
+
 if __name__ == "__main__":
     test_rsa()
+    test_crt_decryption()
+    test_block_mode()
+    test_codebook()
+    test_candidate_sieve()
+    test_generate_keypairs()
+    test_key_pool()
+    test_primality_fast_paths()
+    test_stream_encryption()
+    test_ciphertext_container()
+    test_parallel_encryption()
+    test_factoring()
+    test_vector_engine()
+    test_batch_gcd()
+    test_benchmark_compare()
+    test_metrics()
+    test_signatures()
+    test_key_objects()
+    test_keystore()
+    test_multi_prime_keys()
+    test_order_finding()
+    test_hybrid_encryption()
+    test_service()
@@ -0,0 +1,85 @@
+import importlib.util
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import-time budgets, measured with -X importtime, as multiples
+# of the time a fresh interpreter takes to import this reference module.
+# Timing both in the same run keeps the budgets meaningful on a slow or
+# busy machine; bench_rsa is the place for absolute numbers.
+REFERENCE_MODULE = "json"
+RSA_LIB_BUDGET = 20
+PAGE_BUDGET = 60
+
+# Each time is the best of this many fresh interpreters, to shed noise
+RUNS = 3
+
+# Modules that must never be paid for at import time
+HEAVY_MODULES = ("numpy", "pandas", "concurrent.futures")
+
+def import_times(code):
+    """
+    Runs code in a fresh interpreter with -X importtime.
+    Returns {module: cumulative microseconds} for every module it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = [field.strip() for field in line[len("import time:"):].split("|")]
+        if fields[1].isdigit():
+            times[fields[2]] = int(fields[1])
+    return times
+
+def best_import_times(code):
+    """import_times of code in RUNS fresh interpreters, keeping each module's best time."""
+    runs = [import_times(code) for _ in range(RUNS)]
+    return {module: min(times.get(module, elapsed) for times in runs) for module, elapsed in runs[0].items()}
+
+def reference_time():
+    return best_import_times(f"import {REFERENCE_MODULE}")[REFERENCE_MODULE]
+
+def test_rsa_lib_cold_start():
+    reference = reference_time()
+    times = best_import_times("import rsa_lib")
+    assert times["rsa_lib"] < RSA_LIB_BUDGET * reference, \
+        f"rsa_lib took {times['rsa_lib']} us to import, over {RSA_LIB_BUDGET}x import {REFERENCE_MODULE} ({reference} us)"
+    for module in HEAVY_MODULES:
+        assert module not in times, f"importing rsa_lib pulled in {module}"
+
+def test_pages_import_lazily():
+    if importlib.util.find_spec("streamlit") is None:
+        return
+    # streamlit itself is imported first so only each page's own cost is measured
+    baseline = import_times("import streamlit")
+    reference = reference_time()
+    for page in ("home", "key_generation", "encryption", "decryption", "attack", "about", "quantum"):
+        module = f"views.{page}"
+        times = best_import_times(f"import streamlit; import {module}")
+        assert times[module] < PAGE_BUDGET * reference, \
+            f"{module} took {times[module]} us to import, over {PAGE_BUDGET}x import {REFERENCE_MODULE} ({reference} us)"
+        for heavy in HEAVY_MODULES:
+            assert heavy in baseline or heavy not in times, f"importing {module} pulled in {heavy}"
+
+    # Rendering the landing page must not import any other page
+    script = (
+        "import sys\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "at = AppTest.from_file('app.py')\n"
+        "at.run()\n"
+        "assert not at.exception, at.exception\n"
+        "print(' '.join(sorted(m for m in sys.modules if m.startswith('views.'))))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["views.home"]
+
+if __name__ == "__main__":
+    test_rsa_lib_cold_start()
+    test_pages_import_lazily()
+    print("Startup budgets met.")
@@ -0,0 +1,19 @@
+import streamlit as st
+
+def render():
+    st.markdown('<div class="main-header">About RSA</div>', unsafe_allow_html=True)
+    st.markdown("""
+    **RSA (Rivest–Shamir–Adleman)** is a public-key cryptosystem that is widely used for secure data transmission. It is also one of the oldest.
+    
+    The acronym RSA comes from the surnames of Ron Rivest, Adi Shamir, and Leonard Adleman, who publicly described the algorithm in 1977.
+    
+    ### Key Concepts
+    1.  **Asymmetric Encryption**: Uses two different keys (public and private).
+    2.  **Trapdoor Function**: Easy to compute in one direction, hard to reverse without special information (the private key).
+    3.  **Prime Factorization**: The security relies on the practical difficulty of factoring the product of two large prime numbers.
+    
+    ### References
+    - [Wikipedia: RSA (cryptosystem)](https://en.wikipedia.org/wiki/RSA_(cryptosystem))
+    - [Khan Academy: Journey into Cryptography](https://www.khanacademy.org/computing/computer-science/cryptography)
+    """)
+
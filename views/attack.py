@@ -0,0 +1,88 @@
+import streamlit as st
+
+import factoring
+import rsa_lib
+
+def render():
+    st.markdown('<div class="main-header">💥 Attack Demonstration</div>', unsafe_allow_html=True)
+    st.markdown("Why is RSA secure? Because factoring large numbers is **hard**.")
+    
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("### The Factorization Problem")
+    st.markdown("The public key contains $n = p \\times q$. If an attacker can factor $n$ into $p$ and $q$, they can calculate $\phi(n)$ and then the private key $d$.")
+    
+    st.markdown("#### Try it yourself!")
+    st.markdown("Here is a small $n$. Can you find $p$ and $q$?")
+    
+    challenge_p = 61
+    challenge_q = 53
+    challenge_n = challenge_p * challenge_q
+    
+    st.latex(f"n = {challenge_n}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        guess_p = st.number_input("Guess p:", min_value=2, step=1)
+    with col2:
+        guess_q = st.number_input("Guess q:", min_value=2, step=1)
+        
+    if st.button("Check Factors"):
+        if guess_p * guess_q == challenge_n and guess_p > 1 and guess_q > 1:
+            st.success(f"Correct! {guess_p} * {guess_q} = {challenge_n}")
+            st.balloons()
+        else:
+            st.error(f"Incorrect. {guess_p} * {guess_q} = {guess_p * guess_q} (Target: {challenge_n})")
+            
+    st.markdown("---")
+    st.markdown("### Attack Bob's Key")
+    if not st.session_state.key_generated:
+        st.info("Generate a key pair in Step 1 to attack it here.")
+    else:
+        n_bits = st.session_state.n.bit_length()
+        st.markdown(f"Eve only sees the public key. Its modulus has **{n_bits} bits**:")
+        st.latex(f"n = {st.session_state.n}")
+        st.markdown("She factors $n$ with trial division, then Pollard's rho (Brent's variant), then Pollard's $p-1$.")
+        if n_bits > 96:
+            st.caption("Keys above ~96 bits will almost certainly outlast the time budget — that is the point of RSA.")
+        budget = st.slider("Time budget (seconds)", 1, 60, 10)
+        
+        if st.button("Factor n", type="primary"):
+            progress_bar = st.progress(0.0, text="Trial division...")
+            
+            def report(stage, fraction):
+                progress_bar.progress(fraction, text=f"Running {stage}...")
+            
+            result = factoring.recover_private_key(st.session_state.public_key, budget=budget, progress=report)
+            progress_bar.empty()
+            
+            if result is None:
+                st.error(f"No factor found within {budget} s. Bob's key survives!")
+            else:
+                *primes, d = result
+                st.success("Key broken!")
+                st.latex("n = " + " \\times ".join(map(str, primes)))
+                st.latex(f"d = e^{{-1}} \\bmod \\phi(n) = {d}")
+                if d == st.session_state.d:
+                    st.markdown("The recovered $d$ matches Bob's private exponent.")
+                if st.session_state.encrypted_message:
+                    ciphertext = st.session_state.encrypted_message
+                    try:
+                        if ciphertext.mode == 'hybrid':
+                            stolen = rsa_lib.hybrid_decrypt((d, st.session_state.n), st.session_state.encrypted_blob).decode('utf-8')
+                        else:
+                            stolen = rsa_lib.decrypt_message((d, st.session_state.n), ciphertext, ciphertext.mode)
+                        st.markdown(f"Eve can now read Alice's message: **{stolen}**")
+                    except ValueError:
+                        pass
+            
+    st.markdown("---")
+    st.markdown("### Real World Security")
+    st.markdown("""
+    In the real world, $n$ is 2048 bits (about 617 digits).
+    
+    - **Small n (15 bits)**: Instant to factor.
+    - **Medium n (256 bits)**: Minutes/Hours on a PC.
+    - **Large n (2048 bits)**: Billions of years on a supercomputer.
+    """)
+    st.markdown('</div>', unsafe_allow_html=True)
+
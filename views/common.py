@@ -0,0 +1,150 @@
+import base64
+import os
+
+import streamlit as st
+
+import rsa_lib
+
+# Encryption modes offered on the Encryption and Decryption pages
+ENCRYPTION_MODES = {
+    "Per-character": "char",
+    "Block-packed (UTF-8)": "block",
+    "Hybrid (RSA key wrap + keystream)": "hybrid",
+}
+
+@st.cache_resource
+def get_key_pool():
+    """Key pool shared by every session, refilled in the background."""
+    import key_pool
+    return key_pool.KeyPool(
+        target=int(os.environ.get("RSA_KEY_POOL_TARGET", "2")),
+        path=os.environ.get("RSA_KEY_POOL_FILE"),
+    )
+
+@st.cache_resource
+def service_client():
+    """
+    Client for a running rsa_service when RSA_SERVICE_URL is set, else
+    None and everything is computed in-process.
+    """
+    url = os.environ.get("RSA_SERVICE_URL")
+    if not url:
+        return None
+    import rsa_service
+    return rsa_service.Client(url)
+
+def backend():
+    """rsa_service.Client or the rsa_lib module; both offer the same calls."""
+    return service_client() or rsa_lib
+
+@st.cache_resource(max_entries=64)
+def key_material(primes, e):
+    """
+    Key pair objects (with their CRT parameters) built once per key and
+    shared by every session and rerun. primes is a tuple.
+    """
+    return rsa_lib.keypair_from_factors(primes, e)
+
+def ciphertext_view(blob):
+    """Lazy view of a ciphertext: a HybridHeader for hybrid mode, else a CiphertextView."""
+    try:
+        return rsa_lib.decode_ciphertext(blob)
+    except ValueError:
+        return rsa_lib.HybridHeader(blob)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def encrypt_cached(public_key, message, mode):
+    """
+    Encrypts and hashes a message once per (key, message, mode).
+    Hybrid ciphertexts carry their own MAC, so they get no separate hash.
+    """
+    if mode == 'hybrid':
+        return rsa_lib.hybrid_encrypt(public_key, message), None
+    compute = backend()
+    cipher = compute.encrypt_message(public_key, message, mode)
+    return rsa_lib.encode_ciphertext(public_key, cipher, mode), compute.compute_hash(message)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def decrypt_cached(public_key, blob, mode, _private_key):
+    """
+    Decrypts a ciphertext container and hashes the result, once per
+    (key, ciphertext, mode). The private key is identified by public_key
+    and left out of the cache key. Hybrid ciphertexts are verified by
+    their MAC instead, and get no hash.
+    """
+    if mode == 'hybrid':
+        return rsa_lib.hybrid_decrypt(_private_key, blob).decode('utf-8'), None
+    compute = backend()
+    decrypted = compute.decrypt_message(_private_key, rsa_lib.decode_ciphertext(blob), mode)
+    return decrypted, compute.compute_hash(decrypted)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def receipt_cached(public_key, message, _private_key):
+    """
+    Bob's signature over a decrypted message and whether it verifies
+    under his public key, once per (key, message).
+    """
+    signature = rsa_lib.sign(_private_key, message)
+    return signature, rsa_lib.verify(public_key, message, signature)
+
+# Blocks shown per page of the ciphertext viewer
+PAGE_SIZE = 20
+
+# How the ciphertext viewer can render each block
+CIPHERTEXT_FORMATS = {
+    "Hex": bytes.hex,
+    "Base64": lambda block: base64.b64encode(block).decode('ascii'),
+    "Decimal": lambda block: str(int.from_bytes(block, 'big')),
+}
+
+def _blocks(blob):
+    """
+    (view, block bytes, width) for a ciphertext. A hybrid ciphertext is
+    shown as its wrapped key followed by the frames, cut to the same width.
+    """
+    view = ciphertext_view(blob)
+    if view.mode == 'hybrid':
+        return view, memoryview(blob)[view.size - view.width:], view.width
+    return view, view.blocks, view.width
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def ciphertext_page(blob, fmt, page, page_size=PAGE_SIZE):
+    """
+    One page of ciphertext blocks rendered in fmt, one numbered line per
+    block. Only that page's blocks are converted, once per page.
+    """
+    _, blocks, width = _blocks(blob)
+    render = CIPHERTEXT_FORMATS[fmt]
+    first = page * page_size
+    last = min(first + page_size, -(-len(blocks) // width))
+    return "\n".join(f"{i:>6}  {render(bytes(blocks[i * width:(i + 1) * width]))}" for i in range(first, last))
+
+def ciphertext_viewer(blob, key):
+    """
+    Shows a ciphertext a page of blocks at a time, in hex, base64 or
+    decimal, with a download button for the full binary container.
+    key keeps the widgets of each page apart.
+    """
+    view, blocks, width = _blocks(blob)
+    count = -(-len(blocks) // width)
+    pages = max(1, -(-count // PAGE_SIZE))
+    if view.mode == 'hybrid':
+        st.caption(f"{len(blob):,} bytes: the wrapped key, then {len(blob) - view.size:,} bytes of authenticated frames, "
+                   f"shown in {width}-byte blocks.")
+    else:
+        st.caption(f"{count:,} block(s) of {width} bytes, {len(blob):,} bytes in total.")
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        fmt = st.radio("Show as", list(CIPHERTEXT_FORMATS), horizontal=True, key=f"{key}_format")
+    with col2:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    st.code(ciphertext_page(blob, fmt, min(page, pages) - 1), language=None)
+
+    st.download_button(
+        "Download ciphertext",
+        blob,
+        file_name="ciphertext.rsah" if view.mode == 'hybrid' else "ciphertext.rsac",
+        mime="application/octet-stream",
+        key=f"{key}_download",
+    )
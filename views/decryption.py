@@ -0,0 +1,92 @@
+import streamlit as st
+
+import rsa_lib
+from views.common import ENCRYPTION_MODES, ciphertext_viewer, decrypt_cached, key_material, receipt_cached
+
+def render():
+    st.markdown('<div class="main-header">Step 3: Decryption</div>', unsafe_allow_html=True)
+    
+    if not st.session_state.encrypted_message:
+        st.warning("⚠️ No message has been encrypted yet! Go to Step 2.")
+    else:
+        st.markdown("Bob receives the ciphertext and uses his **Private Key** to read it.")
+        ciphertext = st.session_state.encrypted_message
+        
+        with st.container():
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            st.markdown("#### Received Ciphertext")
+            ciphertext_viewer(st.session_state.encrypted_blob, key="received")
+            if ciphertext.fingerprint != rsa_lib.key_fingerprint(st.session_state.public_key):
+                st.warning("⚠️ This ciphertext was encrypted for a different key.")
+            mode_labels = list(ENCRYPTION_MODES)
+            mode_label = st.radio(
+                "Decryption mode",
+                mode_labels,
+                index=list(ENCRYPTION_MODES.values()).index(ciphertext.mode),
+                horizontal=True,
+                help="Must match the mode Alice used to encrypt."
+            )
+            mode = ENCRYPTION_MODES[mode_label]
+            
+            if st.button("Decrypt Message", type="primary"):
+                st.session_state.decryption_input = (st.session_state.encrypted_blob, mode)
+            
+            # Only show results for the ciphertext currently held
+            decryption_input = st.session_state.decryption_input
+            if decryption_input is not None and decryption_input[0] == st.session_state.encrypted_blob:
+                mode = decryption_input[1]
+                private_key = key_material(st.session_state.primes, st.session_state.e)[1]
+                # Decrypt
+                try:
+                    decrypted, current_hash = decrypt_cached(st.session_state.public_key, st.session_state.encrypted_blob, mode, private_key)
+                except ValueError:
+                    st.error("❌ Decryption failed. Was the message encrypted in a different mode?")
+                    st.stop()
+                st.session_state.decrypted_message = decrypted
+                
+                st.markdown("### 🔓 Decryption Process")
+                if mode == 'hybrid':
+                    st.markdown("Bob unwraps the secret with one private-key operation, $s = c^d \\mod n$, derives the same keys, checks each frame's MAC and strips the keystream.")
+                elif mode == 'block':
+                    st.markdown("Each ciphertext block is decrypted as: $m = c^d \\mod n$, then the blocks are unpacked into UTF-8 bytes and the padding is removed.")
+                else:
+                    st.markdown("Each ciphertext number is decrypted as: $m = c^d \\mod n$")
+                    
+                    # Show first few
+                    for i, (cipher, char) in enumerate(zip(ciphertext[:5], decrypted[:5])):
+                        col1, col2, col3 = st.columns([2,1,1])
+                        with col1:
+                            st.markdown(f"Cipher: {cipher}")
+                        with col2:
+                            st.markdown(f"ASCII: {ord(char)}")
+                        with col3:
+                            st.markdown(f"**'{char}'**")
+                    
+                    if len(decrypted) > 5:
+                        st.markdown(f"... and {len(decrypted)-5} more characters")
+                
+                st.markdown("### 📜 The Result")
+                st.markdown('<div class="success-box">', unsafe_allow_html=True)
+                st.markdown(f"**Decrypted Message:** {decrypted}")
+                st.markdown('</div>', unsafe_allow_html=True)
+                
+                # Integrity Check
+                st.markdown("#### 🛡️ Integrity Check")
+                if mode == 'hybrid':
+                    st.success("✅ Every frame's BLAKE2b MAC verified, so the message was not altered.")
+                elif current_hash == st.session_state.original_message_hash:
+                    st.success(f"✅ Hash matches: {current_hash[:16]}...")
+                else:
+                    st.error("❌ Hash mismatch!")
+                
+                # A hash only detects accidents; a signature proves who vouched for the text
+                st.markdown("#### ✍️ Signed Receipt")
+                signature, valid = receipt_cached(st.session_state.public_key, decrypted, private_key)
+                st.markdown("Bob signs what he read with his **Private Key**: $s = H(m)^d \\mod n$, where $H$ hashes the message onto the range $0 \\ldots n-1$. Anyone can check it with his **Public Key**: $s^e \\mod n = H(m)$.")
+                st.code(f"s = {signature}")
+                if valid:
+                    st.success("✅ Signature verifies under Bob's public key.")
+                else:
+                    st.error("❌ Signature does not verify!")
+            st.markdown('</div>', unsafe_allow_html=True)
+
@@ -0,0 +1,75 @@
+import streamlit as st
+
+import rsa_lib
+from views.common import ENCRYPTION_MODES, ciphertext_view, ciphertext_viewer, encrypt_cached
+
+def render():
+    st.markdown('<div class="main-header">Step 2: Encryption</div>', unsafe_allow_html=True)
+    
+    if not st.session_state.key_generated:
+        st.warning("⚠️ Bob hasn't generated keys yet! Go to Step 1.")
+    else:
+        st.markdown("Alice wants to send a secret message to Bob. She uses Bob's **Public Key**.")
+        
+        with st.container():
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            message = st.text_input("Enter your message:", "Hello RSA!")
+            mode_label = st.radio(
+                "Encryption mode",
+                list(ENCRYPTION_MODES),
+                horizontal=True,
+                help="Per-character encrypts each character separately. Block-packed encrypts the UTF-8 bytes in blocks sized to fit under n. Hybrid wraps a random secret with RSA once and encrypts the message with a fast keystream, as real systems do."
+            )
+            mode = ENCRYPTION_MODES[mode_label]
+            
+            if st.button("Encrypt Message", type="primary"):
+                if not message:
+                    st.error("Please enter a message.")
+                elif mode == 'block' and rsa_lib.block_size(st.session_state.n) < 1:
+                    st.error("Block mode needs n ≥ 256. Generate a larger key (16 bits or more).")
+                else:
+                    st.session_state.encryption_input = (message, mode)
+            
+            # Results are re-rendered on every rerun, but only computed when the inputs change
+            if st.session_state.encryption_input is not None:
+                message, mode = st.session_state.encryption_input
+                blob, message_hash = encrypt_cached(st.session_state.public_key, message, mode)
+                if blob != st.session_state.encrypted_blob:
+                    # Kept as a compact binary container, read through a lazy view
+                    st.session_state.encrypted_blob = blob
+                    st.session_state.encrypted_message = ciphertext_view(blob)
+                    st.session_state.original_message_hash = message_hash
+                ciphertext = st.session_state.encrypted_message
+                
+                st.success("Message Encrypted!")
+                
+                st.markdown("### 🔢 Encryption Process")
+                if mode == 'hybrid':
+                    st.markdown("One random secret $s$ is wrapped with Bob's public key: $c = s^e \\mod n$. "
+                                "Keys derived from $s$ then encrypt the UTF-8 bytes with a SHAKE-128 keystream and authenticate them with a BLAKE2b MAC.")
+                    st.markdown(f"1 RSA operation for {len(message.encode('utf-8'))} bytes, however long the message")
+                elif mode == 'block':
+                    size = rsa_lib.block_size(st.session_state.n)
+                    st.markdown(f"The UTF-8 bytes are packed into blocks of {size} byte(s), and each block is encrypted as: $c = m^e \\mod n$")
+                    st.markdown(f"{len(message.encode('utf-8'))} bytes → {len(ciphertext)} block(s)")
+                else:
+                    st.markdown("Each character is encrypted as: $c = m^e \\mod n$")
+                    
+                    # Show first few characters
+                    for i, (char, cipher) in enumerate(zip(message[:5], ciphertext[:5])):
+                        col1, col2, col3 = st.columns([1,2,2])
+                        with col1:
+                            st.markdown(f"**'{char}'**")
+                        with col2:
+                            st.markdown(f"ASCII: {ord(char)}")
+                        with col3:
+                            st.markdown(f"Cipher: {cipher}")
+                    
+                    if len(message) > 5:
+                        st.markdown(f"... and {len(message)-5} more characters")
+                
+                st.markdown("### 📦 The Ciphertext")
+                ciphertext_viewer(st.session_state.encrypted_blob, key="encrypted")
+                st.caption("This encrypted data is sent to Bob.")
+            st.markdown('</div>', unsafe_allow_html=True)
+
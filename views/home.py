@@ -0,0 +1,37 @@
+import streamlit as st
+
+def render():
+    st.markdown('<div class="main-header">RSA Public-Key Cryptosystem</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.markdown("""
+        ### Welcome!
+        RSA (Rivest–Shamir–Adleman) is one of the first public-key cryptosystems and is widely used for secure data transmission.
+        
+        In this cryptosystem, the encryption key is public and it is different from the decryption key which is kept secret (private).
+        
+        **How to use this demo:**
+        1.  **Generate Keys**: Bob creates a Public Key (to share) and a Private Key (to keep).
+        2.  **Encrypt**: Alice uses Bob's Public Key to lock a message.
+        3.  **Decrypt**: Bob uses his Private Key to unlock the message.
+        """)
+    
+    with col2:
+        st.markdown("""
+        ### Communication Flow
+        ```
+        Alice                    Bob
+          |                       |
+          |  Public Key (e,n)     |
+          | <--------------------- |
+          |                       |
+          |  Encrypted Message    |
+          | ------------------->  |
+          |                       |
+          |  Private Key (d,n)    |
+          |      (secret)         |
+        ```
+        """)
+
@@ -0,0 +1,152 @@
+import streamlit as st
+
+import rsa_lib
+from views.common import get_key_pool, service_client
+
+# Prime counts offered for multi-prime keys; each prime needs at least 8 bits
+PRIME_COUNTS = (2, 3, 4)
+
+def _prime_names(count):
+    """p, q, then r_3, r_4, ... as in PKCS #1 multi-prime keys."""
+    return ["p", "q"] + [f"r_{i}" for i in range(3, count + 1)]
+
+def _product(terms):
+    return " \\times ".join(terms)
+
+def render():
+    st.markdown('<div class="main-header">Step 1: Key Generation</div>', unsafe_allow_html=True)
+    st.markdown("Bob needs to generate a pair of keys: one public (for Alice) and one private (for himself).")
+    
+    with st.container():
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            key_size = st.select_slider(
+                "Select Key Size (bits)",
+                options=[8, 16, 32, 64, 128, 256, 512, 1024],
+                value=64,
+                help="Larger keys are more secure but slower. For this demo, small keys (8-64 bits) are good for visualization."
+            )
+            prime_count = st.radio(
+                "Number of primes",
+                [k for k in PRIME_COUNTS if k == 2 or key_size // k >= 8],
+                horizontal=True,
+                help="Multi-prime RSA builds n from 3 or 4 smaller primes. They are much quicker to find, and decryption does one small exponentiation per prime."
+            )
+        with col2:
+            st.write("") # Spacer
+            st.write("") # Spacer
+            generate_btn = st.button("Generate Key Pair", type="primary")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    if generate_btn:
+        with st.spinner("Generating primes and calculating keys..."):
+            # 1. Generate p and q (by the RSA service when configured, otherwise
+            # served from the pre-generated pool when ready)
+            client = service_client()
+            if client is not None:
+                keypair, metrics = client.generate_keypair(key_size, prime_count), None
+            elif prime_count == 2:
+                keypair, metrics = get_key_pool().take(key_size)
+            else:
+                # The pool only keeps two-prime keys
+                with rsa_lib.collect_metrics() as metrics:
+                    keypair = rsa_lib.generate_keypair(key_size, primes=prime_count)
+            public_key, private_key, *primes, phi = keypair
+            e, n = public_key
+            d = private_key[0]
+            
+            # Store in session state
+            st.session_state.key_generated = True
+            st.session_state.public_key = public_key
+            st.session_state.private_key = private_key
+            st.session_state.primes = tuple(primes)
+            st.session_state.n = n
+            st.session_state.phi = phi
+            st.session_state.e = e
+            st.session_state.d = d
+            st.session_state.keygen_metrics = metrics.as_dict() if metrics else None
+            # A new key means Alice has to encrypt again
+            st.session_state.encryption_input = None
+            
+            st.success("Keys Generated Successfully!")
+
+    if st.session_state.key_generated:
+        st.markdown("### 🔍 Key Generation Steps")
+        
+        steps_col, timing_col = st.columns([3, 1])
+        with steps_col:
+            primes = st.session_state.primes
+            names = _prime_names(len(primes))
+            count_word = {2: "Two", 3: "Three", 4: "Four"}.get(len(primes), str(len(primes)))
+            with st.expander(f"Step 1: Generate {count_word} Primes", expanded=True):
+                st.markdown('<div class="math-box">', unsafe_allow_html=True)
+                st.latex(" \\quad ".join(f"{name} = {prime}" for name, prime in zip(names, primes)))
+                if len(primes) == 2:
+                    st.markdown("Two large random prime numbers.")
+                else:
+                    st.markdown(f"{count_word} random primes of about {st.session_state.n.bit_length() // len(primes)} bits each (multi-prime RSA).")
+                st.markdown('</div>', unsafe_allow_html=True)
+        
+            with st.expander("Step 2: Compute Modulus"):
+                st.markdown('<div class="math-box">', unsafe_allow_html=True)
+                st.latex(f"n = {_product(names)} = {_product(map(str, primes))} = {st.session_state.n}")
+                st.markdown("The modulus used in both keys.")
+                st.markdown('</div>', unsafe_allow_html=True)
+        
+            with st.expander("Step 3: Euler's Totient"):
+                st.markdown('<div class="math-box">', unsafe_allow_html=True)
+                st.latex(f"\\phi(n) = {_product(f'({name}-1)' for name in names)} = "
+                         f"{_product(f'({prime}-1)' for prime in primes)} = {st.session_state.phi}")
+                st.markdown("Number of integers up to n that are coprime with n.")
+                st.markdown('</div>', unsafe_allow_html=True)
+        
+            with st.expander("Step 4: Choose Public Exponent"):
+                st.markdown('<div class="math-box">', unsafe_allow_html=True)
+                st.latex(f"e = {st.session_state.e}")
+                st.markdown("Chosen such that gcd(e, φ(n)) = 1.")
+                st.markdown('</div>', unsafe_allow_html=True)
+        
+            with st.expander("Step 5: Compute Private Exponent"):
+                st.markdown('<div class="math-box">', unsafe_allow_html=True)
+                st.latex(f"d \\equiv e^{{-1}} \\pmod{{\\phi(n)}} = {st.session_state.d}")
+                st.markdown("The modular inverse of e modulo φ(n).")
+                st.markdown('</div>', unsafe_allow_html=True)
+        
+        with timing_col:
+            st.markdown("**⏱️ Step Timings**")
+            metrics = st.session_state.keygen_metrics
+            if metrics is None:
+                st.caption("This key was generated by the RSA service, pre-generated in another process or loaded from disk, so no timings were recorded.")
+            else:
+                timings = metrics["timings"]
+                steps = [
+                    (f"1. Primes {', '.join(names)}",
+                     sum(seconds for phase, seconds in timings.items() if phase.startswith("prime_"))),
+                    ("2-3. n and φ(n)", timings.get("modulus_totient", 0)),
+                    ("4. Choose e", timings.get("choose_e", 0)),
+                    ("5. Compute d", timings.get("mod_inverse", 0)),
+                    ("CRT parameters", timings.get("crt_params", 0)),
+                ]
+                st.table([{"Step": step, "Time (ms)": f"{seconds * 1e3:.3f}"} for step, seconds in steps])
+                counters = metrics["counters"]
+                st.caption(
+                    f"{counters['candidates']} candidates tested, "
+                    f"{counters['mr_rounds']} Miller-Rabin rounds, "
+                    f"{counters['lucas_tests']} Lucas tests, "
+                    f"{counters['e_retries']} e retries"
+                )
+        
+        st.markdown("### 🔑 Your Keys")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown('<div class="highlight">', unsafe_allow_html=True)
+            st.markdown("**Public Key** (share this)")
+            st.code(f"(e={st.session_state.e}, n={st.session_state.n})")
+            st.markdown('</div>', unsafe_allow_html=True)
+        with col2:
+            st.markdown('<div class="highlight">', unsafe_allow_html=True)
+            st.markdown("**Private Key** (keep secret)")
+            st.code(f"(d={st.session_state.d}, n={st.session_state.n})")
+            st.markdown('</div>', unsafe_allow_html=True)
+
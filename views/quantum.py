@@ -0,0 +1,98 @@
+import random
+
+import streamlit as st
+
+import shor_sim
+
+@st.cache_data(max_entries=32, show_spinner="Finding the period...")
+def _run_shor(N, a, budget, seed):
+    """Shor's algorithm with simulated order finding, once per input."""
+    return shor_sim.shor(N, a or None, budget, rng=random.Random(seed))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _sample_period(a, N, r):
+    return shor_sim.sample_period(a, N, r)
+
+def render():
+    st.markdown('<div class="main-header">⚛️ Quantum Threats to RSA</div>', unsafe_allow_html=True)
+    st.markdown("RSA's security relies on the difficulty of factoring large numbers. Quantum computers threaten this with **Shor's Algorithm**.")
+    
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("### Why Quantum Computers Break RSA")
+    st.markdown("""
+    Classical computers factor numbers using trial division or advanced methods, but it's exponential time.
+    
+    Quantum computers use **Shor's Algorithm** (1994) to factor in polynomial time using quantum Fourier transform.
+    
+    This breaks RSA because once p and q are found, φ(n) and d can be computed easily.
+    """)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("### Shor's Algorithm Overview")
+    st.markdown("""
+    1. **Quantum Period Finding**: Find the period of f(x) = a^x mod N
+    2. **Classical Post-Processing**: Use the period to find factors
+    3. **Repeat**: Until factors are found
+    """)
+    st.latex(r"f(x) = a^x \mod N")
+    st.markdown("If r is the period, and r is even, then gcd(a^{r/2} ± 1, N) may give factors.")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("### Practical Demo: Shor's Algorithm, Simulated")
+    st.markdown("A quantum computer finds the period r of f(x) = a^x mod N. Here a classical order-finding engine (a vectorized scan for small N, then baby-step giant-step) stands in for it, and the classical post-processing turns r into factors. It stays interactive up to about N = 10^12.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        demo_n = st.number_input("Composite number N (e.g., 15, 21, 35, or up to 10^12):", min_value=4, value=15, step=1)
+    with col2:
+        demo_a = st.number_input("Base a (0 = pick at random):", min_value=0, value=0, step=1)
+    budget = st.slider("Time budget (seconds)", 1, 30, 5, key="shor_budget")
+    
+    if st.button("Run Shor's Algorithm", type="primary"):
+        # The random bases are drawn from a seed fixed at click time, so reruns reuse the cached result
+        st.session_state.shor_input = (int(demo_n), int(demo_a), budget, random.randrange(1 << 32))
+    
+    if st.session_state.shor_input is not None:
+        N, a, budget, seed = st.session_state.shor_input
+        factors, attempts = _run_shor(N, a, budget, seed)
+        
+        st.markdown("#### Attempts")
+        st.table([
+            {
+                "a": "—" if attempt.a is None else str(attempt.a),
+                "Period r": "—" if attempt.r is None else str(attempt.r),
+                "Method": attempt.method or "—",
+                "a^(r/2) mod N": "—" if attempt.half_power is None else str(attempt.half_power),
+                "Outcome": attempt.note,
+            }
+            for attempt in attempts
+        ])
+        
+        last = attempts[-1]
+        if last.r is not None and last.r > 1:
+            xs, ys = _sample_period(last.a, N, last.r)
+            st.markdown(f"#### f(x) = {last.a}^x mod {N}: period r = {last.r}")
+            st.line_chart({"x": xs, "f(x)": ys}, x="x", y="f(x)")
+            if last.r > 80:
+                st.caption("Sampled at the same offsets in every period, so the plot repeats exactly once every r.")
+        
+        if factors:
+            st.success(f"Factors: {factors[0]} × {factors[1]} = {N}")
+            st.markdown("Quantum computers could do this for 2048-bit n, where classical order finding is hopeless.")
+        elif last.r is None and last.method:
+            st.error(f"No period found within {budget} s. Larger N would need the quantum speed-up!")
+        else:
+            st.error("No factors found. N may be prime, or every base tried was unlucky.")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("### Real-World Impact")
+    st.markdown("""
+    - **Current Status**: No quantum computer can break 2048-bit RSA yet.
+    - **Transition**: Cryptographers recommend moving to post-quantum algorithms like lattice-based crypto.
+    - **Timeline**: Experts predict quantum advantage by 2030-2040.
+    """)
+    st.markdown('</div>', unsafe_allow_html=True)
+